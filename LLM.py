@@ -1,11 +1,31 @@
 import os
 import json
+import asyncio
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from dotenv import load_dotenv
 
+from dishes import DISH_PREFIX, Dish, DishList, dish_name
+from hedging import HedgePolicy
+from httpSession import get_session
+from localExtractor import LocalExtractor
+from metrics import record_error, record_lookup, record_response, record_usage
+from tracing import span
+from responseCache import ResponseCache, get_cache
+
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
 BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
+MODEL = "llama-3.3-70b-versatile"
+# Padidinti, kai keičiasi užklausos tekstas – seni talpyklos įrašai nebegalios
+PROMPT_VERSION = 2
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 30.0
 
 
 class LLMClient:
@@ -14,90 +34,252 @@ class LLMClient:
     kurie anksčiau buvo modulio lygio funkcijos.
     """
 
-    def __init__(self, api_key: str | None = None, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str = BASE_URL,
+        session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
+        local_extractor: LocalExtractor | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
         self.api_key = api_key or os.getenv("API_KEY")
         self.base_url = base_url
-
-    def call_llama_api(self, query: str) -> dict:
-        """
-        Call Llama API for food extraction
-        """
-        if not query:
-            return {"error": "Prašome įvesti tinkamą patiekalą."}
-
-        if not query.strip():
-            return {"error": "Prašome įvesti tinkamą patiekalą."}
-
-        prompt = (
+        # Be savos sesijos – bendra imama kiekvieną kartą, kad galiotų configure_session
+        self._session = session
+        # Bendra talpykla atidaroma tik pirmą kartą jos prireikus – ne kuriant klientą
+        self._cache = cache
+        # Žinomi patiekalai atpažįstami vietoje, be užklausos į API
+        self.local_extractor = local_extractor
+        # Neprivaloma: lėtos užklausos dubliuojamos (žr. hedging.py)
+        self.hedge_policy = hedge_policy
+        # Terminas taikomas HTTP lygmeniu (requests timeout)
+        self.timeout = timeout
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session or get_session()
+
+    @session.setter
+    def session(self, session: requests.Session | None):
+        self._session = session
+
+    @property
+    def cache(self) -> ResponseCache:
+        if self._cache is None:
+            self._cache = get_cache()
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: ResponseCache):
+        self._cache = cache
+
+    def _known_dishes(self, query: str) -> DishList | None:
+        """Dishes from the local dictionary or the response cache, without the API."""
+        if self.local_extractor is not None:
+            dishes = self.local_extractor.extract(query)
+            if dishes:
+                record_lookup("chat", "local")
+                return dishes
+
+        cached = self.cache.get(self.cache.make_key(query, MODEL, PROMPT_VERSION))
+        if cached is not None:
+            record_lookup("chat", "cache")
+            return DishList.from_json(cached)
+        record_lookup("chat", "api")
+        return None
+
+    def _build_prompt(self, query: str, json_mode: bool = True) -> str:
+        # Srautiniu režimu prašoma eilučių, nes dalinio JSON neišeina skaityti po eilutę
+        if json_mode:
+            answer = '{"dishes": ["Kebabas su česnakiniu padažu", "Cepelinai su kiauliena"]}'
+            empty = 'Jei nebuvo pateikta maisto patiekalų, grąžink {"dishes": []}.'
+            output_format = 'Atsakyk tik JSON objektu: {"dishes": ["[name]", ...]}'
+        else:
+            answer = (
+                f"{DISH_PREFIX} Kebabas su česnakiniu padažu\n"
+                f"{DISH_PREFIX} Cepelinai su kiauliena"
+            )
+            empty = "Jei nebuvo pateikta maisto patiekalų, neatsakyk į žinutę."
+            output_format = f"Formatuokite atsakymą kaip:\n{DISH_PREFIX} [name]"
+        return (
             "Pavyzdys:\n"
             "---EXAMPLE---\n"
             "Šiandien vakare valgiau kebabą su česnakiniu padažu. "
             "Ryte, atsikėlęs valgiau cepelinus su kiauliena.\n"
             "Atsakymas turėtų būti:\n"
-            "- Patiekalas: Kebabas su česnakiniu padažu\n"
-            "- Patiekalas: Cepelinai su kiauliena\n"
+            f"{answer}\n"
             "---END EXAMPLE---\n\n"
             "Patvarkyk rašybos klaidas, žodžių galūnes, kad būtų lietuviškos.\n"
             "Išrink tik maisto produktus ir sudaryk patiekalus iš toliau pateikto "
             "teksto aprašymo, kuris pateikiamas lietuvių kalba. "
-            "Jei nebuvo pateikta maisto patiekalų, neatsakyk į žinutę.\n"
-            "Surašykite juos atskirai nuorodų formatu:\n\n"
+            f"{empty}\n\n"
             "---INPUT---\n"
             f"{query}\n"
             "---END INPUT---\n\n"
-            "Formatuokite atsakymą kaip:\n"
-            "- Patiekalas: [name]"
+            f"{output_format}"
         )
 
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _post(self, data: dict, stream: bool = False, timeout: float | None = None) -> requests.Response:
+        """
+        POST to the chat endpoint, hedged when a hedge policy is set. For
+        streamed calls the hedge races the response headers only.
+        """
+        def send():
+            return self.session.post(
+                self.base_url,
+                headers=self._headers(),
+                data=json.dumps(data),
+                timeout=timeout or self.timeout,
+                stream=stream
+            )
+
+        if self.hedge_policy is None:
+            return send()
+        return self.hedge_policy.call(send, discard=lambda response: response.close())
+
+    def call_llama_api(self, query: str, timeout: float | None = None) -> dict:
+        """
+        Call Llama API for food extraction; `timeout` overrides self.timeout
+        """
+        if not query:
+            return {"error": "Prašome įvesti tinkamą patiekalą."}
+
+        if not query.strip():
+            return {"error": "Prašome įvesti tinkamą patiekalą."}
 
+        known = self._known_dishes(query)
+        if known is not None:
+            return {"dishes": known}
+
+        try:
             data = {
-                "model": "llama-3.3-70b-versatile",
-                "messages": [{"role": "user", "content": prompt}],
+                "model": MODEL,
+                "messages": [{"role": "user", "content": self._build_prompt(query)}],
+                "response_format": {"type": "json_object"},
                 "temperature": 0.7,
                 "max_tokens": 300,
                 "top_p": 1
             }
 
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                data=json.dumps(data),
-                verify=False,
-                timeout=30
-            )
+            started = time.perf_counter()
+            with span("llm", model=MODEL):
+                response = self._post(data, timeout=timeout)
+                record_response("chat", MODEL, response, time.perf_counter() - started)
+
+                response.raise_for_status()
+
+                result = response.json()
+            record_usage(MODEL, result.get("usage"))
+
+            choices = result.get("choices") or []
+            content = choices[0].get("message", {}).get("content") if choices else None
+            if content is None:
+                return {"error": "Negauta atsakymo iš API"}
+
+            try:
+                with span("parsing"):
+                    dishes = DishList.from_json(content)
+            except ValueError:
+                print("Klaida: transkribuotas tekstas tuščias arba neteisingas.")
+                return {"dishes": DishList()}
+
+            if dishes:
+                self.cache.set(self.cache.make_key(query, MODEL, PROMPT_VERSION), dishes.to_json())
+            return {"dishes": dishes}
 
-            response.raise_for_status()
+        except requests.exceptions.Timeout as e:
+            record_error("chat", e)
+            return {"error": "Klaida: baigėsi užklausos laikas."}
+        except requests.exceptions.RequestException as e:
+            record_error("chat", e)
+            return {"error": f"Klaida jungiantis: {str(e)}"}
+        except Exception as e:
+            record_error("chat", e)
+            return {"error": f"Klaida, jungiantis prie API: {str(e)}"}
 
-            result = response.json()
+    def stream_dishes(
+        self,
+        query: str,
+        on_dish: Callable[[Dish], None],
+        cancelled: Callable[[], bool] | None = None
+    ) -> dict:
+        """
+        Streaming call_llama_api: the completion is read as server-sent events
+        and on_dish(dish) is called as soon as each `- Patiekalas:` line ends.
+        Returns the complete {"dishes": DishList} (or {"error": str}) at the end;
+        `cancelled()` returning True stops reading the stream.
+        """
+        if not query or not query.strip():
+            return {"error": "Prašome įvesti tinkamą patiekalą."}
 
-            if "choices" in result:
-                choices = result["choices"]
-                if len(choices) > 0:
-                    if "message" in choices[0]:
-                        message = choices[0]["message"]
-                        if "content" in message:
-                            content = message["content"]
+        known = self._known_dishes(query)
+        if known is not None:
+            for dish in known:
+                on_dish(dish)
+            return {"dishes": known}
 
-                            if not content.strip() or content.strip() == "None":
-                                print("Klaida: transkribuotas tekstas tuščias arba neteisingas.")
-                                return {"text": "Maisto produktų nerasta."}
+        dishes = DishList()
+        started = time.perf_counter()
 
-                            if "Patiekalas:" not in content:
-                                print("Klaida: transkribuotas tekstas tuščias arba neteisingas.")
-                                return {"text": "Maisto produktų nerasta."}
+        def take_line(line: str):
+            name = dish_name(line)
+            if name:
+                if not dishes:
+                    llm_span.set(first_dish_ms=round((time.perf_counter() - started) * 1000, 3))
+                on_dish(dishes.append(name))
 
-                            return {"text": content}
+        try:
+            data = {
+                "model": MODEL,
+                "messages": [{"role": "user", "content": self._build_prompt(query, json_mode=False)}],
+                "temperature": 0.7,
+                "max_tokens": 300,
+                "top_p": 1,
+                "stream": True
+            }
 
-            return {"error": "Negauta atsakymo iš API"}
+            with span("llm", model=MODEL, stream=True) as llm_span, self._post(data, stream=True) as response:
+                response.raise_for_status()
+
+                pending = ""
+                for event in response.iter_lines(decode_unicode=True):
+                    if cancelled is not None and cancelled():
+                        return {"dishes": dishes}
+                    if not event or not event.startswith("data:"):
+                        continue
+                    payload = event[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    chunk = json.loads(payload)
+                    # Groq paskutiniame įvykyje siunčia x_groq.usage, OpenAI – usage
+                    record_usage(MODEL, chunk.get("usage") or chunk.get("x_groq", {}).get("usage"))
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    pending += choices[0].get("delta", {}).get("content") or ""
+                    *lines, pending = pending.split("\n")
+                    for line in lines:
+                        take_line(line)
+                take_line(pending)
+                record_response("chat", MODEL, response, time.perf_counter() - started)
+
+            if dishes:
+                self.cache.set(self.cache.make_key(query, MODEL, PROMPT_VERSION), dishes.to_json())
+            return {"dishes": dishes}
 
         except requests.exceptions.RequestException as e:
+            record_error("chat", e)
             return {"error": f"Klaida jungiantis: {str(e)}"}
         except Exception as e:
+            record_error("chat", e)
             return {"error": f"Klaida, jungiantis prie API: {str(e)}"}
 
     def process_response(self, response: dict) -> str:
@@ -105,25 +287,23 @@ class LLMClient:
         if "error" in response:
             return response["error"]
 
-        result = response.get("text", "Negauta atsakymo")
-
-        if not result.strip() or result.strip() == "None" or "Patiekalas:" not in result:
-            print("Klaida: transkribuotas tekstas tuščias arba neteisingas.")
+        dishes = response.get("dishes")
+        if not dishes:
             return "Maisto produktų nerasta."
 
-        dishes = result.split("\n")
-        formatted_output = "Aptikti patiekalai:\n" + "\n".join(dishes)
-        return formatted_output
+        return "Aptikti patiekalai:\n" + dishes.to_text()
 
     def send_query(self, query: str) -> str:
         """
-        Send query to LLM (anksčiau modulio funkcija send_query)
+        Send query to LLM (anksčiau modulio funkcija send_query). Thin
+        synchronous wrapper over AsyncLLMClient.send_query, so it must not be
+        called from a running event loop.
         """
-        if not query.strip():
-            return "Prašome įvesti tinkamą patiekalą."
+        async def send() -> str:
+            async with AsyncLLMClient(self, concurrency=1, timeout=self.timeout) as client:
+                return await client.send_query(query)
 
-        response = self.call_llama_api(query)
-        return self.process_response(response)
+        return asyncio.run(send())
 
     def validate_input(
         self,
@@ -150,18 +330,9 @@ class LLMClient:
 
     def extract_dishes(self, text: str) -> list[str]:
         """
-        Extract dishes from LLM response
+        Extract dish names from `Patiekalas:` lines (e.g. edited by the user)
         """
-        lines = text.split("\n")
-        dishes: list[str] = []
-
-        for line in lines:
-            if "Patiekalas:" in line:
-                dish = line.replace("Patiekalas:", "").strip()
-                dish = dish.replace("- ", "")
-                dishes.append(dish)
-
-        return dishes
+        return DishList.from_text(text).names()
 
     def format_dishes_output(self, dishes: list[str]) -> str:
         """
@@ -170,10 +341,8 @@ class LLMClient:
         if len(dishes) == 0:
             return "Maisto produktų nerasta."
 
-        output = "Aptikti patiekalai:\n"
-        for i, dish in enumerate(dishes, 1):
-            output += f"{i}. {dish}\n"
-        return output
+        lines = [f"{i}. {dish}\n" for i, dish in enumerate(dishes, 1)]
+        return "Aptikti patiekalai:\n" + "".join(lines)
 
     def safe_api_call(self, query: str) -> dict | None:
         """
@@ -183,4 +352,91 @@ class LLMClient:
             return self.call_llama_api(query)
         except Exception:
             # specialiai nieko nedarom – kaip ir senajame variante
-            return None
\ No newline at end of file
+            return None
+
+
+class AsyncLLMClient:
+    """
+    Asinchroninis LLMClient variantas. Užklausos vykdomos gijose per bendrą
+    jungčių telkinį, su ribotu lygiagretumu ir laiko limitu kiekvienai užklausai.
+    Terminas taikomas visam kvietimui (kartu su pakartojimais ir Retry-After
+    laukimu); atšaukta ar pavėlavusi užklausa, kuri dar nepradėta, į serverį
+    nesiunčiama. Jau išsiųstos užklausos nutraukti negalima – ji baigiasi
+    fone. Gijos atlaisvinamos per close() arba `async with`.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        self.client = client or LLMClient()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # Ne numatytasis ciklo vykdytojas: asyncio.run jo gijų nelaukia,
+        # todėl atšaukimas grįžta iškart, o išsiųsta užklausa baigiasi fone
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm")
+
+    async def call_llama_api(self, query: str) -> dict:
+        """
+        Call Llama API without blocking the event loop
+        """
+        cancelled = threading.Event()
+
+        def call() -> dict:
+            # Užduotis atšaukta, kol laukė laisvos gijos – užklausa nesiunčiama
+            if cancelled.is_set():
+                return {"error": "Užklausa atšaukta."}
+            return self.client.call_llama_api(query, timeout=self.timeout)
+
+        # Kaip ir asyncio.to_thread – gija paveldi kvietėjo kontekstą (tracing)
+        context = contextvars.copy_context()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, context.run, call)
+        try:
+            # HTTP timeout riboja tik vieną skaitymą, todėl bendras terminas – čia
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError as e:
+            cancelled.set()
+            record_error("chat", e)
+            return {"error": "Klaida: baigėsi užklausos laikas."}
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def close(self):
+        """Stop the worker threads; requests already sent finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def send_query(self, query: str) -> str:
+        """
+        Send query to LLM
+        """
+        if not query.strip():
+            return "Prašome įvesti tinkamą patiekalą."
+
+        response = await self.call_llama_api(query)
+        return self.client.process_response(response)
+
+    async def send_query_many(
+        self,
+        queries: Iterable[str],
+        concurrency: int | None = None
+    ) -> list[str]:
+        """
+        Send many queries concurrently; results keep the input order.
+        Atšaukus išorinę užduotį, atšaukiamos ir visos laukiančios užklausos.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def bounded(query: str) -> str:
+            async with semaphore:
+                return await self.send_query(query)
+
+        return await asyncio.gather(*(bounded(query) for query in queries))
@@ -0,0 +1,64 @@
+import struct
+
+import numpy as np
+
+SAMPLE_WIDTH = 2
+
+
+def wav_header(data_size: int, channels: int, sample_rate: int) -> bytes:
+    """Build a 44 byte PCM16 RIFF/WAVE header for `data_size` bytes of samples."""
+    byte_rate = sample_rate * channels * SAMPLE_WIDTH
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate,
+        channels * SAMPLE_WIDTH, SAMPLE_WIDTH * 8,
+        b"data", data_size
+    )
+
+
+class AudioBuffer:
+    """
+    Preallocated in-memory sample buffer filled during capture.
+
+    The audio callback writes straight into claimed slots, so emptiness,
+    duration and size come from the frame counter, and segments are read
+    back as views for encoding without touching the disk.
+    """
+
+    def __init__(self, sample_rate: int, channels: int, max_seconds: float):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.capacity = int(sample_rate * max_seconds)
+        self.frames = 0
+        self.overflow = False
+        # np.zeros gauna nulinius puslapius iš OS – ilgo įrašo rezervas užima
+        # atmintį tik tiek, kiek iš tikrųjų įrašyta
+        self._samples = np.zeros((self.capacity, channels), dtype=np.int16)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.frames == 0
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate)
+
+    @property
+    def size(self) -> int:
+        """Size of the captured PCM samples in bytes."""
+        return self.frames * self.channels * SAMPLE_WIDTH
+
+    def claim(self, frames: int) -> np.ndarray:
+        """Reserve the next `frames` frames and return a writable view over them."""
+        n = min(frames, self.capacity - self.frames)
+        if n < frames:
+            self.overflow = True
+        view = self._samples[self.frames:self.frames + n]
+        self.frames += n
+        return view
+
+    def samples(self, start: int = 0, end: int | None = None) -> np.ndarray:
+        """View of the captured samples between two frame offsets."""
+        end = self.frames if end is None else min(end, self.frames)
+        return self._samples[start:end]
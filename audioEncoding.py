@@ -0,0 +1,172 @@
+import io
+import wave
+from fractions import Fraction
+
+import numpy as np
+
+from audioBuffer import wav_header
+
+try:
+    import soundfile
+except ImportError:  # FLAC neprivalomas – be soundfile siunčiamas WAV
+    soundfile = None
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:  # be scipy – numpy langinis sinc filtras
+    resample_poly = None
+
+# Whisper viską perskaičiuoja į 16 kHz mono, todėl didesnis dažnis tik didina įkėlimą
+TARGET_SAMPLE_RATE = 16_000
+FLAC_MAGIC = b"fLaC"
+# Antialiasing filtras: praleidžiama iki 0.45·target, slopinama nuo 0.5·target
+CUTOFF_RATIO = 0.45
+TRANSITION_RATIO = 0.1
+STOPBAND_DB = 80.0
+FFT_BLOCK = 1 << 16
+# Interpoliacija necielu santykiu: Kaiser langu apribotas sinc, po tiek mėginių į abi puses
+INTERP_HALF_TAPS = 16
+INTERP_BETA = 8.6
+MAX_PHASES = 4096
+_TAP_OFFSETS = np.arange(1 - INTERP_HALF_TAPS, INTERP_HALF_TAPS + 1)
+
+
+def downmix(samples: np.ndarray) -> np.ndarray:
+    """Average the channels of an int16 (frames, channels) block into float32 mono."""
+    if samples.ndim == 1:
+        return samples.astype(np.float32)
+    if samples.shape[1] == 1:
+        return samples[:, 0].astype(np.float32)
+    return samples.mean(axis=1, dtype=np.float32)
+
+
+def lowpass_taps(rate: int, cutoff: float, transition: float) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass FIR with STOPBAND_DB attenuation."""
+    width = 2 * np.pi * transition / rate
+    numtaps = int(np.ceil((STOPBAND_DB - 8) / (2.285 * width))) | 1
+    beta = 0.1102 * (STOPBAND_DB - 8.7)
+    n = np.arange(numtaps) - (numtaps - 1) / 2
+    taps = np.sinc(2 * cutoff / rate * n) * np.kaiser(numtaps, beta)
+    return taps / taps.sum()
+
+
+def fir_filter(mono: np.ndarray, taps: np.ndarray) -> np.ndarray:
+    """Zero-delay FIR filtering by blockwise FFT overlap-add."""
+    size = 1 << (FFT_BLOCK + len(taps) - 2).bit_length()
+    spectrum = np.fft.rfft(taps, size)
+    out = np.zeros(len(mono) + len(taps) - 1)
+    for start in range(0, len(mono), FFT_BLOCK):
+        block = mono[start:start + FFT_BLOCK]
+        filtered = np.fft.irfft(np.fft.rfft(block, size) * spectrum, size)
+        length = len(block) + len(taps) - 1
+        out[start:start + length] += filtered[:length]
+    delay = (len(taps) - 1) // 2
+    return out[delay:delay + len(mono)].astype(np.float32)
+
+
+def _sinc_kernel(fraction: np.ndarray) -> np.ndarray:
+    """Kaiser-windowed sinc weights for samples around each fractional offset."""
+    distance = fraction[:, None] - _TAP_OFFSETS
+    window = np.i0(INTERP_BETA * np.sqrt(np.clip(1 - (distance / INTERP_HALF_TAPS) ** 2, 0, None)))
+    return (np.sinc(distance) * window / np.i0(INTERP_BETA)).astype(np.float32)
+
+
+def sinc_interpolate(mono: np.ndarray, step: Fraction, frames: int) -> np.ndarray:
+    """
+    Band-limited values of `mono` at positions 0, step, 2·step, ... The
+    fractional phases of a rational step repeat, so the kernel is computed
+    once per phase (at most MAX_PHASES, beyond that phases are rounded).
+    """
+    phases = min(step.denominator, MAX_PHASES)
+    table = _sinc_kernel(np.arange(phases) / phases)
+    # Pradžioje ir gale – nuliai, kad kraštiniai mėginiai turėtų visus kaimynus
+    padding = INTERP_HALF_TAPS + 1
+    padded = np.pad(mono, padding)
+    out = np.empty(frames, dtype=np.float32)
+    for start in range(0, frames, FFT_BLOCK):
+        n = np.arange(start, min(frames, start + FFT_BLOCK), dtype=np.int64)
+        base, remainder = np.divmod(n * step.numerator, step.denominator)
+        phase = remainder * phases // step.denominator
+        window = padded[base[:, None] + _TAP_OFFSETS + padding]
+        out[start:start + len(n)] = np.einsum("ij,ij->i", window, table[phase])
+    return out
+
+
+def resample(mono: np.ndarray, rate: int, target: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Resample float32 mono to `target` Hz with scipy's polyphase resampler
+    when it is installed. Otherwise downsampling first applies a
+    Kaiser-windowed sinc low-pass below target/2; integer ratios (48k, 32k)
+    are then decimated and other ratios sinc-interpolated. Upsampling
+    only interpolates.
+    """
+    if rate == target or len(mono) == 0:
+        return mono
+    if resample_poly is not None:
+        ratio = Fraction(target, rate)
+        return resample_poly(mono, ratio.numerator, ratio.denominator).astype(np.float32)
+
+    if rate > target:
+        mono = fir_filter(mono, lowpass_taps(rate, CUTOFF_RATIO * target, TRANSITION_RATIO * target))
+    if rate % target == 0:
+        factor = rate // target
+        frames = len(mono) // factor
+        return mono[:frames * factor:factor]
+
+    frames = int(len(mono) * target / rate)
+    return sinc_interpolate(mono, Fraction(rate, target), frames)
+
+
+def to_pcm16(mono: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(mono), -32768, 32767).astype("<i2")
+
+
+def encode_wav(pcm: np.ndarray, rate: int) -> bytes:
+    data = pcm.tobytes()
+    return wav_header(len(data), 1, rate) + data
+
+
+def encode_flac(pcm: np.ndarray, rate: int) -> bytes | None:
+    """Lossless FLAC encoding, or None when soundfile is not installed."""
+    if soundfile is None:
+        return None
+    buffer = io.BytesIO()
+    soundfile.write(buffer, pcm, rate, format="FLAC", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def encode_for_upload(
+    samples: np.ndarray,
+    sample_rate: int,
+    target_rate: int = TARGET_SAMPLE_RATE,
+    compress: bool = True
+) -> bytes:
+    """
+    Downmix, resample and encode captured int16 samples for Whisper:
+    FLAC when `compress` and soundfile are available, otherwise 16-bit WAV.
+    """
+    pcm = to_pcm16(resample(downmix(samples), sample_rate, target_rate))
+    if compress:
+        flac = encode_flac(pcm, target_rate)
+        if flac is not None:
+            return flac
+    return encode_wav(pcm, target_rate)
+
+
+def encode_wav_bytes(wav: bytes, target_rate: int = TARGET_SAMPLE_RATE, compress: bool = True) -> bytes:
+    """encode_for_upload for a 16-bit PCM WAV file's contents (e.g. batch imports)."""
+    with wave.open(io.BytesIO(wav), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            return wav
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        frames = wf.readframes(wf.getnframes())
+    samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels)
+    return encode_for_upload(samples, rate, target_rate, compress)
+
+
+def upload_format(audio) -> tuple[str, str]:
+    """File name and MIME type for an upload payload (FLAC bytes or WAV)."""
+    if isinstance(audio, (bytes, bytearray)) and audio[:4] == FLAC_MAGIC:
+        return "audio.flac", "audio/flac"
+    return "audio.wav", "audio/wav"
@@ -0,0 +1,168 @@
+"""
+Paketinis garso įrašų importas: validacija, transkripcija, patiekalų
+išgavimas per LLMClient ir įrašymas į duomenų bazę.
+
+    python batchIngest.py recordings/ "field/*.wav" --workers 4 --output results.jsonl
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from audioEncoding import encode_wav_bytes
+from LLM import LLMClient
+from voiceToText import MAX_FILE_SIZE_BYTES, MAX_RECORDING_SECONDS, VoiceToText
+
+DEFAULT_WORKERS = 4
+MIN_RECORDING_SECONDS = 3
+
+
+def collect_files(sources) -> list[str]:
+    """Expand directories and glob patterns into a sorted list of WAV files."""
+    files = set()
+    for source in sources:
+        if os.path.isdir(source):
+            files.update(glob.glob(os.path.join(source, "*.wav")))
+        else:
+            files.update(glob.glob(source) or [source])
+    return sorted(files)
+
+
+def validate_file(path: str, voice: VoiceToText) -> str | None:
+    """Return an error message if the recording is unusable, otherwise None."""
+    if not os.path.isfile(path):
+        return "Failas nerastas"
+    if voice._is_audio_file_empty(path):
+        return "Audio failas tuščias"
+    length = voice._get_audio_length(path)
+    if length > MAX_RECORDING_SECONDS:
+        return f"Įrašymas per ilgas: ({length:.2f} s). Max {MAX_RECORDING_SECONDS}s."
+    if length < MIN_RECORDING_SECONDS:
+        return f"Įrašymas per trumpas: ({length:.2f} s). Min {MIN_RECORDING_SECONDS}s."
+    return None
+
+
+def process_file(path: str, voice: VoiceToText, llm: LLMClient) -> dict:
+    """Validate, transcribe and extract dishes from one recording."""
+    result = {"file": path, "transcription": None, "dishes": [], "error": None}
+
+    error = validate_file(path, voice)
+    if error:
+        result["error"] = error
+        return result
+
+    with open(path, "rb") as audio_file:
+        # Dydis tikrinamas jau perkoduoto (16 kHz mono) įrašo
+        payload = encode_wav_bytes(audio_file.read(), voice.upload_sample_rate, voice.compress_uploads)
+    if len(payload) > MAX_FILE_SIZE_BYTES:
+        result["error"] = f"Failo dydis per didelis: ({len(payload) / 1024:.2f} KB)"
+        return result
+
+    transcription = voice._run_transcription(payload)
+    if transcription.startswith("Klaida"):
+        result["error"] = transcription
+        return result
+    result["transcription"] = transcription
+
+    response = llm.call_llama_api(transcription)
+    if "error" in response:
+        result["error"] = response["error"]
+        return result
+    result["dishes"] = response["dishes"].names()
+    return result
+
+
+def ingest(
+    sources,
+    workers: int = DEFAULT_WORKERS,
+    max_in_flight: int | None = None,
+    output: str | None = None,
+    language: str = "Lithuanian",
+    db=None,
+    save: bool = True,
+    voice: VoiceToText | None = None,
+    llm: LLMClient | None = None,
+    progress=print
+) -> list[dict]:
+    """
+    Run the batch pipeline over `sources` (files, directories or globs).
+
+    Files are processed on a pool of `workers` threads with at most
+    `max_in_flight` submitted at once. As each file completes, its dishes
+    are written to the database in one transaction, their ids are added to
+    the result as `product_ids`, and the result is appended to the `output`
+    JSONL file, so every record links to its saved rows. Returns results
+    in input order.
+    """
+    files = collect_files(sources)
+    max_in_flight = max_in_flight or workers * 2
+    if voice is None:
+        voice = VoiceToText()
+        voice.SetLanguage(language)
+    llm = llm or LLMClient()
+    if save and db is None:
+        from database.database import get_database
+        db = get_database()
+
+    results: list[dict | None] = [None] * len(files)
+    out = open(output, "a", encoding="utf-8") if output else None
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            next_index = 0
+            done_count = 0
+            while next_index < len(files) or pending:
+                while next_index < len(files) and len(pending) < max_in_flight:
+                    future = pool.submit(process_file, files[next_index], voice, llm)
+                    pending[future] = next_index
+                    next_index += 1
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = pending.pop(future)
+                    result = future.result()
+                    if save:
+                        result["product_ids"] = db.add_products(result["dishes"])
+                    results[index] = result
+                    done_count += 1
+                    if out:
+                        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                        out.flush()
+                    if progress:
+                        status = result["error"] or f"{len(result['dishes'])} patiekal."
+                        progress(f"[{done_count}/{len(files)}] {result['file']}: {status}")
+    finally:
+        if out:
+            out.close()
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Paketinis garso įrašų importas")
+    parser.add_argument("sources", nargs="+", help="WAV failai, katalogai arba glob šablonai")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--output", help="JSONL rezultatų failas")
+    parser.add_argument("--language", default="Lithuanian", choices=["Lithuanian", "English"])
+    parser.add_argument("--no-db", action="store_true", help="Neįrašyti patiekalų į duomenų bazę")
+    args = parser.parse_args(argv)
+
+    results = ingest(
+        args.sources,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        output=args.output,
+        language=args.language,
+        save=not args.no_db
+    )
+    failed = sum(1 for result in results if result["error"])
+    print(f"Apdorota: {len(results)}, klaidų: {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
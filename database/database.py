@@ -0,0 +1,369 @@
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import repeat
+
+from dishCanonicalizer import DishCanonicalizer
+
+DB_PATH = "bitetrack.db"
+DEFAULT_PAGE_SIZE = 50
+PERIODS = ("all", "today", "week", "month")
+DEFAULT_TOP_DISHES = 5
+# Didinama, kai keičiasi suvestinių raktas – suvestinės perskaičiuojamos
+ROLLUP_VERSION = 4
+STATEMENT_CACHE_SIZE = 256
+CACHE_SIZE_KIB = 8192
+
+# Dažniausios užklausos – vienodas SQL tekstas leidžia sqlite3 pakartotinai
+# naudoti jau paruoštus sakinius iš ryšio talpyklos
+INSERT_PRODUCT = "INSERT INTO products (product_name, timestamp, dish) VALUES (?, ?, ?)"
+UPDATE_PRODUCT = "UPDATE products SET product_name = ?, dish = ? WHERE id = ?"
+DELETE_PRODUCT = "DELETE FROM products WHERE id = ?"
+SELECT_PRODUCT = "SELECT product_name, timestamp, dish FROM products WHERE id = ?"
+UPSERT_DAILY = (
+    "INSERT INTO daily_dish_counts (day, dish, count) VALUES (?, ?, ?) "
+    "ON CONFLICT(day, dish) DO UPDATE SET count = count + excluded.count"
+)
+UPSERT_TOTAL = (
+    "INSERT INTO dish_totals (dish, count) VALUES (?, ?) "
+    "ON CONFLICT(dish) DO UPDATE SET count = count + excluded.count"
+)
+DELETE_EMPTY_DAILY = "DELETE FROM daily_dish_counts WHERE day = ? AND dish = ? AND count <= 0"
+DELETE_EMPTY_TOTAL = "DELETE FROM dish_totals WHERE dish = ? AND count <= 0"
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+class Database:
+    """
+    SQLite saugykla atpažintiems produktams.
+    Sąrašai rikiuojami nuo naujausių (timestamp, id) ir puslapiuojami
+    pagal raktą, todėl kiekvienas puslapis kainuoja tiek pat,
+    nepriklausomai nuo istorijos ilgio.
+
+    Dienos suvestinės (patiekalas × diena) ir bendros sumos atnaujinamos
+    toje pačioje transakcijoje kaip ir produktų lentelė; savaitės ir
+    mėnesio statistika skaičiuojama iš dienos suvestinių. Suvestinėse
+    patiekalai sutraukiami į kanoninius pavadinimus (DishCanonicalizer);
+    įrašymo metu parinktas kanoninis patiekalas saugomas produkto eilutėje,
+    todėl redaguojant ar trinant mažinamas būtent jo skaitliukas, net jei
+    kanonizatoriaus atitikmenys nuo to laiko pasikeitė.
+
+    Duomenų bazė veikia WAL režimu: visi rašymai eina per vieną ryšį su
+    užraktu, o skaitymai – per atskirą kiekvienos gijos ryšį, todėl
+    statistikos ekrano užklausos neblokuoja įrašymo.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self.conn = self._connect()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL režimu NORMAL išlaiko vientisumą, tik paskutinis commit gali dingti nutrūkus maitinimui
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection; in-memory databases share the writer."""
+        if self.path == ":memory:":
+            return self.conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """
+        Serialized write transaction on the writer connection. Dishes the
+        canonicalizer registered in it are indexed only once it commits.
+        """
+        with self._write_lock:
+            try:
+                with self.conn:
+                    yield self.conn
+            except BaseException:
+                self.canonicalizer.rollback()
+                raise
+            self.canonicalizer.commit()
+
+    def _create_tables(self):
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS products ("
+            "id INTEGER PRIMARY KEY, "
+            "product_name TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, "
+            "dish TEXT)"
+        )
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(products)")}
+        if "dish" not in columns:
+            # Senesnės bazės: dish užpildomas rebuild_rollups metu
+            self.conn.execute("ALTER TABLE products ADD COLUMN dish TEXT")
+        # Puslapiavimas ir laikotarpio filtrai eina šiuo indeksu
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_products_timestamp ON products(timestamp, id)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_dish_counts ("
+            "day TEXT NOT NULL, "
+            "dish TEXT NOT NULL, "
+            "count INTEGER NOT NULL, "
+            "PRIMARY KEY (day, dish))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dish_totals ("
+            "dish TEXT PRIMARY KEY, "
+            "count INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+        self.canonicalizer = DishCanonicalizer(self.conn)
+
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version < ROLLUP_VERSION:
+            # Pasikeitus kanonizavimo taisyklėms patiekalai priskiriami iš naujo
+            self.rebuild_rollups(reassign=True)
+            self.conn.execute(f"PRAGMA user_version={ROLLUP_VERSION}")
+
+    def dish_key(self, product_name: str) -> str:
+        """Canonical dish a product is counted under in the rollups."""
+        return self.canonicalizer.canonicalize(product_name)
+
+    def canonical_dish(self, product_name: str) -> str | None:
+        """Closest known canonical dish, without registering a new one."""
+        match = self.canonicalizer.lookup(product_name)
+        return match[0] if match is not None else None
+
+    def get_dish_names(self) -> list[str]:
+        """All canonical dish names, e.g. to build the local extractor dictionary."""
+        return self.canonicalizer.names()
+
+    def _count_dish(self, dish: str, timestamp: str, delta: int):
+        self._count_dishes({(timestamp[:10], dish): delta})
+
+    def _count_dishes(self, deltas: dict[tuple[str, str], int]):
+        """Apply {(day, dish): delta} to the rollups; call inside a transaction."""
+        daily = [(day, dish, delta) for (day, dish), delta in deltas.items()]
+        totals = Counter()
+        for (_, dish), delta in deltas.items():
+            totals[dish] += delta
+
+        self.conn.executemany(UPSERT_DAILY, daily)
+        self.conn.executemany(UPSERT_TOTAL, totals.items())
+        decremented = [key for key, delta in deltas.items() if delta < 0]
+        if decremented:
+            self.conn.executemany(DELETE_EMPTY_DAILY, decremented)
+            self.conn.executemany(DELETE_EMPTY_TOTAL, ((dish,) for _, dish in decremented))
+
+    def rebuild_rollups(self, reassign: bool = False):
+        """
+        Recompute all rollups from the products table. Rows without a stored
+        canonical dish (older databases), or every row with `reassign`, are
+        assigned one first.
+        """
+        with self._write():
+            missing = self.conn.execute(
+                "SELECT id, product_name FROM products"
+                + ("" if reassign else " WHERE dish IS NULL")
+                + " ORDER BY id"
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE products SET dish = ? WHERE id = ?",
+                [(self.dish_key(row["product_name"]), row["id"]) for row in missing]
+            )
+            self.conn.execute("DELETE FROM daily_dish_counts")
+            self.conn.execute("DELETE FROM dish_totals")
+            deltas = Counter(
+                (row["timestamp"][:10], row["dish"])
+                for row in self.conn.execute("SELECT timestamp, dish FROM products")
+            )
+            self._count_dishes(deltas)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+    @staticmethod
+    def _period_start(period: str) -> str | None:
+        """Lower timestamp bound for a period, None for the whole history."""
+        if period not in PERIODS:
+            raise ValueError(f"Nežinomas laikotarpis: {period}")
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if period == "today":
+            start = today
+        elif period == "week":
+            start = today - timedelta(days=today.weekday())
+        elif period == "month":
+            start = today.replace(day=1)
+        else:
+            return None
+        return start.isoformat(sep=" ", timespec="seconds")
+
+    def _get_product(self, product_id: int) -> sqlite3.Row | None:
+        return self.conn.execute(SELECT_PRODUCT, (product_id,)).fetchone()
+
+    def add_product(self, product_name: str) -> int:
+        timestamp = self._now()
+        with self._write():
+            dish = self.dish_key(product_name)
+            cursor = self.conn.execute(INSERT_PRODUCT, (product_name, timestamp, dish))
+            self._count_dish(dish, timestamp, 1)
+        return cursor.lastrowid
+
+    def add_products(self, product_names: Iterable[str]) -> list[int]:
+        """
+        Insert a batch of products in one transaction and return their ids
+        in input order.
+        """
+        names = list(product_names)
+        if not names:
+            return []
+        timestamp = self._now()
+        day = timestamp[:10]
+        with self._write():
+            # Rašymo užraktas nuo pat pradžių – naujų eilučių id eina iš eilės
+            self.conn.execute("BEGIN IMMEDIATE")
+            (last_id,) = self.conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM products"
+            ).fetchone()
+            dishes = [self.dish_key(name) for name in names]
+            self.conn.executemany(INSERT_PRODUCT, zip(names, repeat(timestamp), dishes))
+            self._count_dishes(Counter((day, dish) for dish in dishes))
+        return list(range(last_id + 1, last_id + 1 + len(names)))
+
+    def update_product(self, product_id: int, product_name: str):
+        with self._write():
+            old = self._get_product(product_id)
+            if old is None:
+                return
+            dish = self.dish_key(product_name)
+            self.conn.execute(UPDATE_PRODUCT, (product_name, dish, product_id))
+            if old["dish"] != dish:
+                self._count_dish(old["dish"], old["timestamp"], -1)
+                self._count_dish(dish, old["timestamp"], 1)
+
+    def delete_product(self, product_id: int):
+        with self._write():
+            old = self._get_product(product_id)
+            if old is None:
+                return
+            self.conn.execute(DELETE_PRODUCT, (product_id,))
+            self._count_dish(old["dish"], old["timestamp"], -1)
+
+    def get_products_page(
+        self,
+        period: str = "all",
+        cursor: tuple[str, int] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> tuple[list[dict], tuple[str, int] | None]:
+        """
+        One page of products, newest first. Pass the returned cursor back in
+        to get the next page; it is None once there are no more rows.
+        """
+        conditions = []
+        params: list = []
+        start = self._period_start(period)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if cursor is not None:
+            conditions.append("(timestamp, id) < (?, ?)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        rows = self._reader().execute(
+            "SELECT id, product_name, timestamp FROM products "
+            f"{where}ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (*params, page_size + 1)
+        ).fetchall()
+
+        products = [dict(row) for row in rows[:page_size]]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = products[-1]
+            next_cursor = (last["timestamp"], last["id"])
+        return products, next_cursor
+
+    def iter_products(self, period: str = "all", page_size: int = DEFAULT_PAGE_SIZE):
+        """Yield products newest first, fetching one page at a time."""
+        cursor = None
+        while True:
+            products, cursor = self.get_products_page(period, cursor, page_size)
+            yield from products
+            if cursor is None:
+                return
+
+    def get_all_products(self) -> list[dict]:
+        return list(self.iter_products("all"))
+
+    def get_products_today(self) -> list[dict]:
+        return list(self.iter_products("today"))
+
+    def get_products_this_week(self) -> list[dict]:
+        return list(self.iter_products("week"))
+
+    def get_products_this_month(self) -> list[dict]:
+        return list(self.iter_products("month"))
+
+    def get_dish_counts(self, period: str = "all", limit: int | None = None) -> list[dict]:
+        """
+        Meals per dish in a period, most frequent first. Reads only the
+        rollups, so the cost depends on the period, not the history length.
+        """
+        start = self._period_start(period)
+        limit_sql = " LIMIT ?" if limit is not None else ""
+        limit_params = (limit,) if limit is not None else ()
+        if start is None:
+            rows = self._reader().execute(
+                "SELECT dish, count FROM dish_totals ORDER BY count DESC, dish" + limit_sql,
+                limit_params
+            ).fetchall()
+        else:
+            rows = self._reader().execute(
+                "SELECT dish, SUM(count) AS count FROM daily_dish_counts WHERE day >= ? "
+                "GROUP BY dish ORDER BY count DESC, dish" + limit_sql,
+                (start[:10], *limit_params)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_top_dishes(self, period: str = "week", limit: int = DEFAULT_TOP_DISHES) -> list[dict]:
+        return self.get_dish_counts(period, limit)
+
+    def get_meals_per_day(self, period: str = "week") -> list[dict]:
+        """Number of recorded meals for each day in a period, oldest first."""
+        start = self._period_start(period)
+        where = "WHERE day >= ? " if start is not None else ""
+        params = (start[:10],) if start is not None else ()
+        rows = self._reader().execute(
+            "SELECT day, SUM(count) AS count FROM daily_dish_counts "
+            f"{where}GROUP BY day ORDER BY day",
+            params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def get_database() -> Database:
+    """Shared storage engine; screens and the batch importer receive this instance."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = Database()
+    return _shared
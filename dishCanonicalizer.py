@@ -0,0 +1,236 @@
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+
+DEFAULT_THRESHOLD = 0.7
+# „su …“ skiria patiekalą nuo priedų; jungtukai į trigramų indeksą nepatenka,
+# kitaip kiekviena „X su Y“ eilutė taptų kandidatu bet kuriai kitai
+TAIL_SEPARATOR = "su"
+STOP_WORDS = frozenset({"su", "ir", "bei", "ar"})
+
+_LITHUANIAN_FOLD = str.maketrans("ąčęėįšųūž", "aceeisuuz")
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fold(text: str) -> str:
+    """Lower-case and strip Lithuanian (and other) diacritics and punctuation."""
+    text = text.lower().translate(_LITHUANIAN_FOLD)
+    text = "".join(
+        char for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    )
+    text = _NON_WORD.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def split_dish(folded: str) -> tuple[str, str | None]:
+    """
+    Split a folded name into the dish and its "su ..." tail (None without
+    one), both without stop words.
+    """
+    words = folded.split(" ")
+    tail = None
+    if TAIL_SEPARATOR in words[1:]:
+        at = words.index(TAIL_SEPARATOR, 1)
+        words, tail = words[:at], words[at + 1:]
+        tail = " ".join(word for word in tail if word not in STOP_WORDS) or None
+    head = " ".join(word for word in words if word not in STOP_WORDS)
+    return head or folded, tail
+
+
+def trigrams(folded: str) -> set[str]:
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class DishCanonicalizer:
+    """
+    Maps free-text dish names onto canonical dishes with a trigram index.
+
+    Names are folded (case, diacritics) and split into the dish and its
+    "su ..." tail. Both parts must reach the threshold in Dice similarity of
+    their trigram sets, and a name with a tail never matches one without,
+    so "kava su pienu", "kava su cukrumi" and "kava" stay three dishes while
+    spelling variants of each collapse. Only dish-part trigrams are indexed,
+    and candidates are drawn from the rarest of them. Dishes and their
+    trigrams are persisted in SQLite and kept in memory for lookups.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection | None = None,
+        threshold: float = DEFAULT_THRESHOLD
+    ):
+        self.conn = conn
+        self.threshold = threshold
+        self._names: dict[int, str] = {}
+        self._heads: dict[int, set[str]] = {}
+        self._tails: dict[int, set[str] | None] = {}
+        self._by_folded: dict[str, int] = {}
+        self._index: dict[str, set[int]] = {}
+        # Į dar neįrašytą transakciją pridėti patiekalai – į indeksą tik po commit()
+        self._pending: dict[str, int] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        if conn is not None:
+            self._create_tables()
+            self._load()
+
+    def _create_tables(self):
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS canonical_dishes ("
+            "id INTEGER PRIMARY KEY, "
+            "name TEXT NOT NULL, "
+            "folded TEXT NOT NULL UNIQUE)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dish_trigrams ("
+            "trigram TEXT NOT NULL, "
+            "dish_id INTEGER NOT NULL, "
+            "PRIMARY KEY (trigram, dish_id)) WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def _load(self):
+        for dish_id, name, folded in self.conn.execute(
+            "SELECT id, name, folded FROM canonical_dishes"
+        ):
+            self._describe(dish_id, name, folded)
+            self._index_dish(dish_id, folded)
+        self._next_id = max(self._names, default=0) + 1
+
+        # Senesnės bazės indeksavo visą pavadinimą – indeksas perrašomas
+        expected = {(gram, dish_id) for dish_id, grams in self._heads.items() for gram in grams}
+        stored = set(self.conn.execute("SELECT trigram, dish_id FROM dish_trigrams"))
+        if stored != expected:
+            with self.conn:
+                self.conn.execute("DELETE FROM dish_trigrams")
+                self.conn.executemany(
+                    "INSERT INTO dish_trigrams (trigram, dish_id) VALUES (?, ?)", expected
+                )
+
+    def _describe(self, dish_id: int, name: str, folded: str):
+        head, tail = split_dish(folded)
+        self._names[dish_id] = name
+        self._heads[dish_id] = trigrams(head)
+        self._tails[dish_id] = trigrams(tail) if tail else None
+
+    def _index_dish(self, dish_id: int, folded: str):
+        self._by_folded[folded] = dish_id
+        for gram in self._heads[dish_id]:
+            self._index.setdefault(gram, set()).add(dish_id)
+
+    def _candidates(self, head: set[str]) -> set[int]:
+        """
+        Dishes sharing at least one of the query's rarest head trigrams. A
+        match needs ceil(t*n/(2-t)) common trigrams of the query's n, so it
+        must appear among the n - that + 1 rarest ones.
+        """
+        needed = math.ceil(self.threshold * len(head) / (2 - self.threshold))
+        rarest = sorted(head, key=lambda gram: len(self._index.get(gram, ())))
+        candidates = set(self._pending.values())
+        for gram in rarest[:len(head) - needed + 1]:
+            candidates.update(self._index.get(gram, ()))
+        return candidates
+
+    def lookup(self, name: str) -> tuple[str, float] | None:
+        """Closest canonical dish and its similarity, or None below the threshold."""
+        folded = fold(name)
+        if not folded:
+            return None
+        head_text, tail_text = split_dish(folded)
+        head = trigrams(head_text)
+        tail = trigrams(tail_text) if tail_text else None
+        with self._lock:
+            exact = self._by_folded.get(folded, self._pending.get(folded))
+            if exact is not None:
+                return self._names[exact], 1.0
+
+            best, best_score = None, 0.0
+            for dish_id in self._candidates(head):
+                other_tail = self._tails[dish_id]
+                if (tail is None) != (other_tail is None):
+                    continue
+                score = _dice(head, self._heads[dish_id])
+                if score < self.threshold:
+                    continue
+                if tail is not None:
+                    tail_score = _dice(tail, other_tail)
+                    if tail_score < self.threshold:
+                        continue
+                    score = (score + tail_score) / 2
+                if score > best_score:
+                    best, best_score = dish_id, score
+            if best is None:
+                return None
+            return self._names[best], best_score
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return [self._names[dish_id] for dish_id in self._by_folded.values()]
+
+    def canonicalize(self, name: str) -> str:
+        """
+        Canonical name for `name`; unknown dishes become canonical themselves.
+        Call inside the caller's write transaction so new dishes commit with it.
+        """
+        if not fold(name):
+            return name.strip()
+        match = self.lookup(name)
+        if match is not None:
+            return match[0]
+        return self.add(name)
+
+    def add(self, name: str) -> str:
+        """
+        Register `name` as a canonical dish. With a connection the row is
+        written in the caller's transaction and indexed only after commit();
+        until then it is visible to lookups but undone by rollback().
+        """
+        folded = fold(name)
+        display = _WHITESPACE.sub(" ", name).strip()
+        with self._lock:
+            existing = self._by_folded.get(folded, self._pending.get(folded))
+            if existing is not None:
+                return self._names[existing]
+            dish_id = self._next_id
+            self._next_id += 1
+            self._describe(dish_id, display, folded)
+            self._pending[folded] = dish_id
+            grams = self._heads[dish_id]
+        if self.conn is None:
+            self.commit()
+            return display
+        self.conn.execute(
+            "INSERT INTO canonical_dishes (id, name, folded) VALUES (?, ?, ?)",
+            (dish_id, display, folded)
+        )
+        self.conn.executemany(
+            "INSERT INTO dish_trigrams (trigram, dish_id) VALUES (?, ?)",
+            ((gram, dish_id) for gram in grams)
+        )
+        return display
+
+    def commit(self):
+        """Index the dishes added since the last commit()/rollback()."""
+        with self._lock:
+            for folded, dish_id in self._pending.items():
+                self._index_dish(dish_id, folded)
+            self._pending.clear()
+
+    def rollback(self):
+        """Forget the dishes added since the last commit()/rollback()."""
+        with self._lock:
+            for dish_id in self._pending.values():
+                del self._names[dish_id], self._heads[dish_id], self._tails[dish_id]
+            self._pending.clear()
+            self._next_id = max(self._names, default=0) + 1
@@ -0,0 +1,97 @@
+import json
+
+DISH_LABEL = "Patiekalas:"
+DISH_PREFIX = f"- {DISH_LABEL}"
+
+
+def dish_name(line: str) -> str | None:
+    """
+    Name after `Patiekalas:` anywhere in one line, or None for any other
+    line; `- Patiekalas: X`, `1. Patiekalas: X` and `Patiekalas: X` all count.
+    """
+    _, label, name = line.partition(DISH_LABEL)
+    if not label:
+        return None
+    return name.strip() or None
+
+
+class Dish:
+    """One recognized dish; `id` is its position in the list, starting at 1."""
+
+    __slots__ = ("id", "name")
+
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+    def __repr__(self):
+        return f"Dish({self.id!r}, {self.name!r})"
+
+
+class DishList:
+    """
+    Dishes extracted from one utterance. Parsed once in the LLM layer and
+    passed as-is to the UI and the database, so every stage sees the same
+    result. to_text() renders the editable `- Patiekalas:` lines.
+    """
+
+    __slots__ = ("items", "_next_id")
+
+    def __init__(self, names=()):
+        self.items: list[Dish] = []
+        self._next_id = 1
+        for name in names:
+            self.append(name)
+
+    @classmethod
+    def from_json(cls, content: str) -> "DishList":
+        """Parse `{"dishes": [...]}` from JSON mode; raises ValueError if malformed."""
+        data = json.loads(content)
+        dishes = data.get("dishes") if isinstance(data, dict) else None
+        if not isinstance(dishes, list):
+            raise ValueError("Atsakyme nėra sąrašo 'dishes'")
+        names = []
+        for dish in dishes:
+            name = dish.get("name") if isinstance(dish, dict) else dish
+            if isinstance(name, str) and name.strip() and name.strip() != "None":
+                names.append(name.strip())
+        return cls(names)
+
+    @classmethod
+    def from_text(cls, text: str) -> "DishList":
+        """Parse `Patiekalas: name` lines, e.g. after the user edited them."""
+        return cls(name for name in map(dish_name, text.split("\n")) if name)
+
+    def append(self, name: str) -> Dish:
+        dish = Dish(self._next_id, name)
+        self._next_id += 1
+        self.items.append(dish)
+        return dish
+
+    def get(self, dish_id: int) -> Dish | None:
+        return next((dish for dish in self.items if dish.id == dish_id), None)
+
+    def remove(self, dish_id: int):
+        self.items = [dish for dish in self.items if dish.id != dish_id]
+
+    def clear(self):
+        self.items.clear()
+        self._next_id = 1
+
+    def names(self) -> list[str]:
+        return [dish.name for dish in self.items]
+
+    def to_json(self) -> str:
+        return json.dumps({"dishes": self.names()}, ensure_ascii=False)
+
+    def to_text(self) -> str:
+        return "\n".join(f"{DISH_PREFIX} {dish.name}" for dish in self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"DishList({self.names()!r})"
@@ -0,0 +1,167 @@
+"""
+Request hedging for Groq calls: if a request is slower than a recent
+latency percentile, a duplicate is sent and the first answer wins.
+
+    policy = HedgePolicy("chat", percentile=0.95, max_hedge_ratio=0.1)
+    client = LLMClient(hedge_policy=policy)
+
+The loser is cancelled if it has not started yet; otherwise its result is
+discarded as soon as it arrives (streamed responses are closed without
+reading the body). max_hedge_ratio caps duplicates as a share of all
+requests, which bounds the extra spend.
+"""
+
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from metrics import get_registry
+from tracing import current_span
+
+DEFAULT_PERCENTILE = 0.95
+DEFAULT_MAX_HEDGE_RATIO = 0.1
+DEFAULT_WINDOW = 200
+MIN_SAMPLES = 20
+# Kol nesukaupta pakankamai matavimų, dublikatas siunčiamas po tiek sekundžių
+DEFAULT_DELAY = 2.0
+MIN_DELAY = 0.05
+DEFAULT_MAX_WORKERS = 16
+
+
+class HedgePolicy:
+    """
+    When to hedge: the `percentile` of the last `window` primary-request
+    latencies (clamped to min/max delay), while hedges stay below
+    `max_hedge_ratio` of requests. One policy is shared by all calls of a
+    client, so its executor bounds the number of threads in flight.
+    """
+
+    def __init__(
+        self,
+        name: str = "groq",
+        percentile: float = DEFAULT_PERCENTILE,
+        max_hedge_ratio: float = DEFAULT_MAX_HEDGE_RATIO,
+        window: int = DEFAULT_WINDOW,
+        default_delay: float = DEFAULT_DELAY,
+        min_delay: float = MIN_DELAY,
+        max_delay: float | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{name}")
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> float:
+        """Seconds to wait for the primary request before sending a duplicate."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MIN_SAMPLES:
+            delay = self.default_delay
+        else:
+            delay = samples[max(0, math.ceil(self.percentile * len(samples)) - 1)]
+        delay = max(self.min_delay, delay)
+        return min(delay, self.max_delay) if self.max_delay is not None else delay
+
+    def _start_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_hedge_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _record_win(self, hedge_won: bool):
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+        get_registry().counter(
+            "groq_hedges_total", "Hedged requests by which copy answered first"
+        ).inc(policy=self.name, winner="hedge" if hedge_won else "primary")
+
+    def stats(self) -> dict:
+        delay = self.delay()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_ratio": self.hedges / self.requests if self.requests else 0.0,
+                "delay": delay,
+            }
+
+    def call(self, fn, discard=None):
+        """
+        Run fn() with hedging and return the first successful result.
+        `discard(result)` releases a losing attempt's result (e.g. closes a
+        streamed response). If every attempt fails, the first error is raised.
+        """
+        self._start_request()
+        started = time.perf_counter()
+
+        def attempt(primary: bool):
+            result = fn()
+            if primary:
+                self.observe(time.perf_counter() - started)
+            return result
+
+        primary = self._submit(attempt, True)
+        done, _ = wait([primary], timeout=self.delay())
+        if done or not self._allow_hedge():
+            return primary.result()
+
+        active = current_span()
+        if active is not None:
+            active.set(hedged=True)
+
+        hedge = self._submit(attempt, False)
+        pending = {primary, hedge}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    errors.append(future.exception())
+                    continue
+                for loser in (done | pending) - {future}:
+                    self._abandon(loser, discard)
+                self._record_win(future is hedge)
+                if active is not None:
+                    active.set(hedge_won=future is hedge)
+                return future.result()
+        raise errors[0]
+
+    def _submit(self, attempt, primary: bool):
+        # Bandymai priklauso tam pačiam pėdsakui (trace) kaip ir kvietėjas
+        return self._executor.submit(contextvars.copy_context().run, attempt, primary)
+
+    @staticmethod
+    def _abandon(future, discard):
+        if future.cancel() or discard is None:
+            return
+
+        def release(done):
+            if not done.cancelled() and done.exception() is None:
+                discard(done.result())
+        future.add_done_callback(release)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
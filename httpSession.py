@@ -0,0 +1,90 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+PREWARM_TIMEOUT = 5.0
+
+_session: requests.Session | None = None
+_lock = threading.Lock()
+
+
+def _build_session(pool_connections: int, pool_maxsize: int,
+                   retries: int, backoff_factor: float) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"HEAD", "GET", "POST"}),
+        # Skaitymo laiko limitas nekartojamas – kitaip užklausos terminas pasidaugintų
+        read=False,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR
+) -> requests.Session:
+    """
+    Replace the shared session with one using the given pool and retry settings.
+    Clients without their own session look it up on every request, so they
+    pick up the replacement too.
+    """
+    global _session
+    with _lock:
+        old = _session
+        _session = _build_session(pool_connections, pool_maxsize, retries, backoff_factor)
+    if old is not None:
+        old.close()
+    return _session
+
+
+def get_session() -> requests.Session:
+    """
+    Shared keep-alive session for all Groq calls (chat completions and transcriptions).
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session(
+                    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE,
+                    DEFAULT_RETRIES, DEFAULT_BACKOFF_FACTOR
+                )
+    return _session
+
+
+def prewarm(session: requests.Session, url: str, timeout: float = PREWARM_TIMEOUT) -> threading.Thread:
+    """
+    Open a pooled connection to `url`'s host on `session` (the one the
+    caller will send through) in the background, so the next real request
+    skips the TCP+TLS handshake.
+    """
+    def warm():
+        try:
+            session.head(url, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"Nepavyko paruošti jungties: {e}")
+
+    thread = threading.Thread(target=warm, daemon=True)
+    thread.start()
+    return thread
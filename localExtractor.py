@@ -0,0 +1,166 @@
+import threading
+from collections import deque
+
+from dishCanonicalizer import fold
+from dishes import DishList
+
+# Linksniuojamas tik pirmas (pagrindinis) žodis: "cepelinai su kiauliena" ->
+# "cepelinus su kiauliena". Galūnės be diakritikų, nes tekstas lyginamas po fold().
+ENDINGS = {
+    "iai": ("iai", "ius", "iu", "iams", "iais"),
+    "ai": ("ai", "us", "u", "ams", "ais"),
+    "as": ("as", "a", "o", "ui", "u", "e", "ai", "us"),
+    "is": ("is", "i", "io", "iui", "iu", "yje", "ius", "iai"),
+    "ys": ("ys", "i", "io", "iui", "iu", "yje", "ius", "iai"),
+    "us": ("us", "u", "aus", "ui", "umi"),
+    "os": ("os", "as", "u", "oms"),
+    "es": ("es", "e", "iu", "ems"),
+    "a": ("a", "os", "ai", "oje", "as", "u"),
+    "e": ("e", "es", "ei", "eje", "iu"),
+}
+
+# Žodžiai, kurie gali likti neatpažinti, o tekstas vis tiek laikomas pilnai suprastu
+STOPWORDS = frozenset(fold(word) for word in (
+    "valgiau suvalgiau gėriau išgėriau užkandau šiandien vakar užvakar "
+    "ryte rytą vakare vakarą dieną per pietus pusryčius vakarienę pietums "
+    "pusryčiams vakarienei ir bei dar o taip pat buvo "
+    "aš man mano paskui vėliau po to kai atsikėlęs atsikėlusi"
+).split())
+
+
+def inflected_forms(name: str) -> set[str]:
+    """Folded name plus its head word in the common Lithuanian case forms."""
+    folded = fold(name)
+    if not folded:
+        return set()
+    head, _, rest = folded.partition(" ")
+    suffix = f" {rest}" if rest else ""
+    forms = {folded}
+    for ending, variants in ENDINGS.items():
+        if head.endswith(ending) and len(head) > len(ending) + 1:
+            stem = head[:-len(ending)]
+            forms.update(f"{stem}{variant}{suffix}" for variant in variants)
+            break
+    return forms
+
+
+class _Automaton:
+    """Aho-Corasick automaton over folded patterns."""
+
+    def __init__(self, patterns: dict[str, str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, str]]] = [[]]
+        for pattern, value in patterns.items():
+            self._add(pattern, value)
+        self._link()
+
+    def _add(self, pattern: str, value: str):
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), value))
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def matches(self, text: str):
+        """Yield (start, end, value) for every pattern occurrence."""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._out[state]:
+                yield i + 1 - length, i + 1, value
+
+
+class LocalExtractor:
+    """
+    Recognizes known dishes without calling the LLM.
+
+    The automaton is built from stored dish names and their inflected forms.
+    An utterance is answered locally only when every word is covered by a
+    dish match or is a filler word; otherwise extract() returns None and the
+    caller falls back to the LLM. attempts/hits give the local hit rate.
+    """
+
+    def __init__(self, dish_names=()):
+        self.attempts = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self.rebuild(dish_names)
+
+    @classmethod
+    def from_database(cls, db) -> "LocalExtractor":
+        return cls(db.get_dish_names())
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    def stats(self) -> dict:
+        return {"attempts": self.attempts, "hits": self.hits, "hit_rate": self.hit_rate}
+
+    def rebuild(self, dish_names):
+        patterns = {}
+        for name in dish_names:
+            for form in inflected_forms(name):
+                patterns.setdefault(form, name.strip())
+        self._automaton = _Automaton(patterns)
+
+    def _select(self, text: str) -> list[tuple[int, int, str]]:
+        """Longest non-overlapping matches that start and end on word boundaries."""
+        candidates = [
+            (start, end, value)
+            for start, end, value in self._automaton.matches(text)
+            if (start == 0 or text[start - 1] == " ")
+            and (end == len(text) or text[end] == " ")
+        ]
+        candidates.sort(key=lambda match: (-(match[1] - match[0]), match[0]))
+        taken = []
+        for start, end, value in candidates:
+            if all(end <= s or start >= e for s, e, _ in taken):
+                taken.append((start, end, value))
+        return sorted(taken)
+
+    def extract(self, query: str) -> DishList | None:
+        """Dishes in the utterance, or None unless the whole utterance is understood."""
+        with self._lock:
+            self.attempts += 1
+        text = fold(query)
+        if not text:
+            return None
+
+        matches = self._select(text)
+        if not matches:
+            return None
+        leftover = []
+        position = 0
+        for start, end, _ in matches:
+            leftover.append(text[position:start])
+            position = end
+        leftover.append(text[position:])
+        if any(word not in STOPWORDS for word in " ".join(leftover).split()):
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return DishList(dict.fromkeys(value for _, _, value in matches))
@@ -0,0 +1,263 @@
+"""
+In-process metrics registry for the Groq clients: counters, gauges and
+latency histograms with labels, dumped as JSON or Prometheus text.
+
+    from metrics import get_registry
+    print(get_registry().dump_prometheus())
+"""
+
+import json
+import math
+import threading
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RATELIMIT_HEADERS = {
+    "x-ratelimit-remaining-requests": "requests",
+    "x-ratelimit-remaining-tokens": "tokens",
+}
+
+_registry: "Registry | None" = None
+_lock = threading.Lock()
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def samples(self) -> list[tuple[tuple, object]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def to_dict(self) -> list[dict]:
+        return [{"labels": dict(key), "value": value} for key, value in self.samples()]
+
+    def to_prometheus(self) -> list[str]:
+        return self._header() + [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in self.samples()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def samples(self) -> list[tuple[tuple, dict]]:
+        with self._lock:
+            return [
+                (key, {"counts": list(state["counts"]), "sum": state["sum"], "count": state["count"]})
+                for key, state in self._values.items()
+            ]
+
+    def to_dict(self) -> list[dict]:
+        result = []
+        for key, state in self.samples():
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                buckets[_format_value(bound)] = cumulative
+            result.append({
+                "labels": dict(key),
+                "count": state["count"],
+                "sum": state["sum"],
+                "buckets": buckets,
+            })
+        return result
+
+    def to_prometheus(self) -> list[str]:
+        lines = self._header()
+        for key, state in self.samples():
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {state['count']}")
+        return lines
+
+
+class Registry:
+    """Named metrics; asking twice for the same name returns the same metric."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metrika {name} jau užregistruota kaip {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "samples": metric.to_dict()}
+            for metric in metrics
+        }
+
+    def dump_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def dump_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.to_prometheus())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+
+def get_registry() -> Registry:
+    """Process-wide registry shared by LLMClient and VoiceToText."""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = Registry()
+    return _registry
+
+
+def record_response(endpoint: str, model: str, response, seconds: float,
+                    registry: Registry | None = None):
+    """
+    Latency, status, urllib3 retries and rate-limit headroom of one Groq
+    HTTP response (a requests.Response).
+    """
+    registry = registry or get_registry()
+    status = getattr(response, "status_code", "unknown")
+    registry.histogram(
+        "groq_request_seconds", "Groq HTTP request latency"
+    ).observe(seconds, endpoint=endpoint, model=model)
+    registry.counter(
+        "groq_requests_total", "Groq HTTP requests by status"
+    ).inc(endpoint=endpoint, model=model, status=status)
+
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None)
+    if isinstance(history, tuple) and history:
+        registry.counter(
+            "groq_retries_total", "Requests retried by the HTTP adapter"
+        ).inc(len(history), endpoint=endpoint)
+
+    headers = getattr(response, "headers", None) or {}
+    for header, resource in RATELIMIT_HEADERS.items():
+        value = headers.get(header)
+        try:
+            remaining = float(value)
+        except (TypeError, ValueError):
+            continue
+        registry.gauge(
+            "groq_ratelimit_remaining", "Remaining Groq rate limit from the last response"
+        ).set(remaining, endpoint=endpoint, resource=resource)
+
+
+def record_error(endpoint: str, error: Exception, registry: Registry | None = None):
+    (registry or get_registry()).counter(
+        "groq_errors_total", "Failed Groq calls by exception type"
+    ).inc(endpoint=endpoint, error=type(error).__name__)
+
+
+def record_usage(model: str, usage: dict | None, registry: Registry | None = None):
+    """Prompt/completion tokens from the `usage` block of a chat completion."""
+    if not isinstance(usage, dict):
+        return
+    tokens = (registry or get_registry()).counter("groq_tokens_total", "Tokens billed by Groq")
+    for kind in ("prompt", "completion"):
+        count = usage.get(f"{kind}_tokens")
+        if isinstance(count, (int, float)):
+            tokens.inc(count, model=model, kind=kind)
+
+
+def record_lookup(client: str, source: str, registry: Registry | None = None):
+    """A request answered without (source="local"/"cache") or with (source="api") the API."""
+    (registry or get_registry()).counter(
+        "groq_lookups_total", "Requests by where the answer came from"
+    ).inc(client=client, source=source)
+
+
+def record_audio(model: str, seconds: float, registry: Registry | None = None):
+    (registry or get_registry()).counter(
+        "groq_audio_seconds_total", "Audio seconds sent for transcription"
+    ).inc(seconds, model=model)
@@ -0,0 +1,173 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_PATH = "llm_cache.sqlite3"
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_ENTRY_BYTES = "LENGTH(CAST(key AS BLOB)) + LENGTH(CAST(value AS BLOB))"
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def normalize_query(text: str) -> str:
+    """Lower-case, strip punctuation and collapse whitespace."""
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class ResponseCache:
+    """
+    Two-tier cache: an in-process LRU in front of an SQLite table.
+    Entries expire after `ttl` seconds; both tiers evict least recently
+    used entries once they hold more than their entry limit, and the disk
+    tier also once its keys and values exceed `disk_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_PATH,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        disk_entries: int = DEFAULT_DISK_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        table: str = "responses",
+        disk_bytes: int | None = None
+    ):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.disk_bytes = disk_bytes
+        self.ttl = ttl
+        self.table = table
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed)"
+            )
+            self._conn.commit()
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @staticmethod
+    def make_key(query: str, model: str, prompt_version: int | str) -> str:
+        return f"{model}\x1f{prompt_version}\x1f{normalize_query(query)}"
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self._conn.execute(
+                        f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key)
+                    )
+                    self._conn.commit()
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._evict_disk(now)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute(f"DELETE FROM {self.table}")
+                self._conn.commit()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, value: str, created: float):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float):
+        self._conn.execute(f"DELETE FROM {self.table} WHERE created <= ?", (now - self.ttl,))
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if count > self.disk_entries:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)",
+                (count - self.disk_entries,)
+            )
+        if self.disk_bytes is None:
+            return
+        (size,) = self._conn.execute(
+            f"SELECT COALESCE(SUM({_ENTRY_BYTES}), 0) FROM {self.table}"
+        ).fetchone()
+        if size <= self.disk_bytes:
+            return
+        rows = self._conn.execute(
+            f"SELECT key, {_ENTRY_BYTES} FROM {self.table} ORDER BY accessed"
+        ).fetchall()
+        expired = []
+        for key, entry_size in rows:
+            if size <= self.disk_bytes:
+                break
+            expired.append((key,))
+            size -= entry_size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", expired)
+
+
+def get_cache() -> ResponseCache:
+    """Shared cache used by LLMClient when none is passed in."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache()
+    return _default_cache
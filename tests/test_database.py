@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database import Database  # noqa: E402
+
+
+class RollupTests(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(":memory:")
+
+    def test_delete_uses_dish_chosen_at_insert(self):
+        # Trečias patiekalas tampa atskiru kanoniniu įrašu, todėl antrojo
+        # pavadinimas dabar atitiktų jį, o ne „cepelinai“
+        self.db.add_product("cepelinai")
+        second = self.db.add_product("cepelinai su kiauliena")
+        self.db.add_product("cepelinai su kiaulienos spirgais")
+
+        self.db.delete_product(second)
+
+        self.assertEqual(self.db.get_top_dishes("all"), [
+            {"dish": "cepelinai", "count": 1},
+            {"dish": "cepelinai su kiaulienos spirgais", "count": 1},
+        ])
+
+    def test_update_moves_count_from_stored_dish(self):
+        self.db.add_product("cepelinai")
+        second = self.db.add_product("cepelinai su kiauliena")
+        self.db.add_product("cepelinai su kiaulienos spirgais")
+
+        self.db.update_product(second, "kava")
+
+        self.assertEqual(self.db.get_top_dishes("all"), [
+            {"dish": "cepelinai", "count": 1},
+            {"dish": "cepelinai su kiaulienos spirgais", "count": 1},
+            {"dish": "kava", "count": 1},
+        ])
+
+
+class CanonicalDishTests(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(":memory:")
+
+    def test_failed_insert_does_not_register_dish(self):
+        with self.assertRaises(AttributeError):
+            self.db.add_products(["Bulviniai blynai", None])
+        self.assertIsNone(self.db.canonical_dish("Bulviniai blynai"))
+
+        self.db.add_product("Bulviniai blynai")
+        stored = self.db.conn.execute("SELECT name FROM canonical_dishes").fetchall()
+        self.assertEqual([row["name"] for row in stored], ["Bulviniai blynai"])
+
+
+if __name__ == "__main__":
+    unittest.main()
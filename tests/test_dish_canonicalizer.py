@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dishCanonicalizer import DishCanonicalizer, split_dish  # noqa: E402
+
+
+class DishCanonicalizerTests(unittest.TestCase):
+    def setUp(self):
+        self.canonicalizer = DishCanonicalizer()
+
+    def canonicalize(self, *names):
+        return [self.canonicalizer.canonicalize(name) for name in names]
+
+    def test_split_drops_stop_words(self):
+        self.assertEqual(split_dish("kava su pienu ir cukrumi"), ("kava", "pienu cukrumi"))
+        self.assertEqual(split_dish("cepelinai"), ("cepelinai", None))
+
+    def test_spelling_variants_collapse(self):
+        self.assertEqual(
+            self.canonicalize("Cepelinai su kiauliena", "cepelinai su kiaulienos", "Cepelinų su kiauliena"),
+            ["Cepelinai su kiauliena"] * 3
+        )
+
+    def test_different_tails_stay_distinct(self):
+        self.assertEqual(
+            self.canonicalize("Blynai su varške", "Blynai su kiauliena", "Kava su pienu", "kava su cukrumi"),
+            ["Blynai su varške", "Blynai su kiauliena", "Kava su pienu", "kava su cukrumi"]
+        )
+
+    def test_bare_dish_never_takes_a_tail(self):
+        # Nepriklausomai nuo eiliškumo – „Kava“ nevirsta „Kava su pienu“ ir atvirkščiai
+        self.assertEqual(self.canonicalize("Kava su pienu", "Kava"), ["Kava su pienu", "Kava"])
+        self.assertEqual(
+            self.canonicalize("Kebabas", "Kebabas su česnakiniu padažu"),
+            ["Kebabas", "Kebabas su česnakiniu padažu"]
+        )
+
+    def test_rolled_back_dish_is_forgotten(self):
+        conn = sqlite3.connect(":memory:")
+        canonicalizer = DishCanonicalizer(conn)
+        with conn:
+            canonicalizer.add("Kava")
+        canonicalizer.commit()
+        canonicalizer.add("Arbata")
+        conn.rollback()
+        canonicalizer.rollback()
+
+        self.assertEqual(canonicalizer.names(), ["Kava"])
+        self.assertIsNone(canonicalizer.lookup("Arbata"))
+        self.assertEqual(canonicalizer.add("Arbata"), "Arbata")
+
+
+if __name__ == "__main__":
+    unittest.main()
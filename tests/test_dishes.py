@@ -0,0 +1,26 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dishes import DishList, dish_name  # noqa: E402
+
+
+class DishNameTests(unittest.TestCase):
+    def test_label_anywhere_in_line(self):
+        for line in ("- Patiekalas: Cepelinai", "1. Patiekalas: Cepelinai", "Patiekalas: Cepelinai",
+                     "  - Patiekalas:   Cepelinai  "):
+            self.assertEqual(dish_name(line), "Cepelinai", line)
+
+    def test_other_lines_are_skipped(self):
+        for line in ("Aptikti patiekalai:", "", "- Patiekalas:", "Cepelinai"):
+            self.assertIsNone(dish_name(line), line)
+
+    def test_from_text_round_trip(self):
+        dishes = DishList(["Kava su pienu", "Cepelinai"])
+        self.assertEqual(DishList.from_text("Aptikti patiekalai:\n" + dishes.to_text()).names(), dishes.names())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voiceActivity import DEFAULT_GAIN, VoiceActivityDetector  # noqa: E402
+
+SAMPLE_RATE = 16_000
+
+
+def blocks(vad, seconds, levels):
+    """Sine blocks whose post-gain RMS cycles through `levels`."""
+    t = np.arange(vad.block_size) / SAMPLE_RATE
+    tone = np.sqrt(2) * np.sin(2 * np.pi * 220 * t)
+    for i in range(int(seconds / 0.02)):
+        level = levels[i % len(levels)] / DEFAULT_GAIN
+        yield np.rint(tone * level).astype(np.int16).reshape(-1, 1)
+
+
+def run(vad, seconds, levels):
+    out = np.empty((vad.block_size, 1), dtype=np.int16)
+    return [vad.process(block, out) for block in blocks(vad, seconds, levels)]
+
+
+class VoiceActivityTests(unittest.TestCase):
+    def test_continuous_utterance_is_never_cut(self):
+        # Kalba su 3 dB ir 6 dB įdubomis kas 0.2 s – tyla neturi būti aptikta
+        for dip in (0.71, 0.5):
+            vad = VoiceActivityDetector(SAMPLE_RATE, 1)
+            levels = [3000.0] * 7 + [3000.0 * dip] * 3
+            self.assertTrue(all(run(vad, 20, levels)))
+            self.assertEqual(vad.silent_frames, 0)
+
+    def test_steady_voiced_signal_stays_speech(self):
+        vad = VoiceActivityDetector(SAMPLE_RATE, 1)
+        self.assertTrue(all(run(vad, 20, [3000.0])))
+
+    def test_steady_noise_below_threshold_is_learned(self):
+        vad = VoiceActivityDetector(SAMPLE_RATE, 1)
+        self.assertFalse(any(run(vad, 10, [450.0])))
+        self.assertGreater(vad.noise_floor, 300)
+
+    def test_speech_after_noise_is_detected(self):
+        vad = VoiceActivityDetector(SAMPLE_RATE, 1)
+        run(vad, 10, [450.0])
+        self.assertTrue(all(run(vad, 2, [3000.0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
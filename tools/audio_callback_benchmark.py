@@ -0,0 +1,100 @@
+"""
+Per-block cost of the recording callback: the old gain/clip/RMS pipeline
+against VoiceActivityDetector writing into a preallocated AudioBuffer.
+The old callback writes to a real temporary WAV file, as it did with
+temp.wav, so file-buffer growth is not counted against it.
+
+    python tools/audio_callback_benchmark.py --rate 48000 --channels 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audioBuffer import AudioBuffer  # noqa: E402
+from voiceActivity import VoiceActivityDetector  # noqa: E402
+
+
+def make_blocks(count, block_size, channels, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        rng.integers(-3000, 3000, size=(block_size, channels), dtype=np.int16)
+        for _ in range(count)
+    ]
+
+
+def legacy_callback(wf):
+    """The callback as it was before the VAD stage (gain, clip, astype, tobytes, RMS)."""
+    def callback(indata):
+        gain = 10.0
+        amplified_data = np.clip(indata * gain, -32768, 32767).astype(np.int16)
+        wf.writeframes(amplified_data.tobytes())
+        rms = np.sqrt(np.mean(amplified_data.astype(np.float32) ** 2))
+        return rms < 500
+    return callback
+
+
+def vad_callback(audio, vad):
+    def callback(indata):
+        return not vad.process(indata, audio.claim(len(indata)))
+    return callback
+
+
+def measure(callback, blocks):
+    # Laikas – be tracemalloc, nes jis pats lėtina alokacijas
+    for block in blocks[:10]:
+        callback(block)
+    start = time.perf_counter()
+    for block in blocks:
+        callback(block)
+    per_block_us = (time.perf_counter() - start) / len(blocks) * 1e6
+
+    tracemalloc.start()
+    peak_bytes = 0
+    for block in blocks[:200]:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        callback(block)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes = max(peak_bytes, peak - before)
+    tracemalloc.stop()
+    return per_block_us, peak_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=48000)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--blocks", type=int, default=5000)
+    args = parser.parse_args()
+
+    vad = VoiceActivityDetector(args.rate, args.channels)
+    blocks = make_blocks(args.blocks, vad.block_size, args.channels)
+    # Buferis turi sutalpinti įšilimo, laiko ir alokacijų matavimo blokus
+    seconds = (args.blocks + 210) * vad.block_size / args.rate + 1
+
+    with tempfile.TemporaryFile() as wav_file, wave.open(wav_file, "wb") as wf:
+        wf.setnchannels(args.channels)
+        wf.setsampwidth(2)
+        wf.setframerate(args.rate)
+        legacy = measure(legacy_callback(wf), blocks)
+
+    audio = AudioBuffer(args.rate, args.channels, seconds)
+    current = measure(vad_callback(audio, vad), blocks)
+
+    print(f"block: {vad.block_size} frames x {args.channels} ch @ {args.rate} Hz")
+    print(f"{'variant':<10}{'us/block':>12}{'peak alloc B/block':>22}")
+    for name, (us, peak) in (("legacy", legacy), ("vad", current)):
+        print(f"{name:<10}{us:>12.2f}{peak:>22}")
+
+
+if __name__ == "__main__":
+    main()
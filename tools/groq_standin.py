@@ -0,0 +1,272 @@
+"""
+Local stand-in for the Groq endpoints used by LLMClient and VoiceToText,
+for load tests without the paid API.
+
+    python tools/groq_standin.py --port 8765 --chat-latency lognormal:-1.2,0.4 --rate-limit-rate 0.05
+    python tools/groq_standin.py --slow-rate 0.02 --slow-latency fixed:10
+
+Then point the clients at it:
+    LLMClient(base_url="http://127.0.0.1:8765/openai/v1/chat/completions")
+    voice.transcription_url = "http://127.0.0.1:8765/openai/v1/audio/transcriptions"
+
+Latency specs: fixed:S, uniform:LOW,HIGH, exp:MEAN, lognormal:MU,SIGMA (seconds).
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = "/openai/v1/chat/completions"
+TRANSCRIPTION_PATH = "/openai/v1/audio/transcriptions"
+DEFAULT_PORT = 8765
+# 16 kHz, 16 bitų mono WAV – transkripcijos trukmė įvertinama iš dydžio
+BYTES_PER_AUDIO_SECOND = 32_000
+STREAM_CHUNK_CHARS = 8
+RATELIMIT_REQUESTS = 14_400
+RATELIMIT_TOKENS = 6_000
+
+CANNED_DISHES = [
+    "Cepelinai su kiauliena",
+    "Kebabas su česnakiniu padažu",
+    "Šaltibarščiai",
+    "Kava su pienu",
+    "Blynai su varške",
+    "Balandėliai",
+]
+CANNED_TRANSCRIPTION = "Šiandien valgiau cepelinus su kiauliena ir gėriau kavą su pienu."
+
+
+def parse_latency(spec: str):
+    """Sampler for a latency spec such as `uniform:0.1,0.4`."""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    samplers = {
+        "fixed": lambda: values[0],
+        "uniform": lambda: random.uniform(values[0], values[1]),
+        "exp": lambda: random.expovariate(1 / values[0]),
+        "lognormal": lambda: random.lognormvariate(values[0], values[1]),
+    }
+    if kind not in samplers:
+        raise argparse.ArgumentTypeError(f"nežinomas vėlinimo tipas: {spec}")
+    return samplers[kind]
+
+
+class StandInState:
+    """Settings and counters shared by all handler threads."""
+
+    def __init__(self, args):
+        self.chat_latency = args.chat_latency
+        self.audio_latency = args.audio_latency
+        self.error_rate = args.error_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.retry_after = args.retry_after
+        self.slow_rate = args.slow_rate
+        self.slow_latency = args.slow_latency
+        self.max_dishes = args.max_dishes
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def count(self, key: str):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "GroqStandIn/1.0"
+
+    @property
+    def state(self) -> StandInState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        # httpSession.prewarm siunčia HEAD jungčiai paruošti
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+
+        if self.path == CHAT_PATH:
+            endpoint, latency = "chat", self.state.chat_latency
+        elif self.path == TRANSCRIPTION_PATH:
+            endpoint, latency = "transcription", self.state.audio_latency
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        self.state.count(endpoint)
+
+        roll = random.random()
+        if roll < self.state.rate_limit_rate:
+            self.state.count(f"{endpoint}_429")
+            self._send_json(
+                429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                {"Retry-After": str(self.state.retry_after), "x-ratelimit-remaining-requests": "0"}
+            )
+            return
+
+        delay = latency()
+        if random.random() < self.state.slow_rate:
+            # Pavieniai „užstrigę“ atsakymai – tai, ką turi nukirpti hedging.py
+            self.state.count(f"{endpoint}_slow")
+            delay += self.state.slow_latency()
+        time.sleep(max(0.0, delay))
+        if roll < self.state.rate_limit_rate + self.state.error_rate:
+            self.state.count(f"{endpoint}_500")
+            self._send_json(500, {"error": {"message": "Injected server error"}})
+            return
+
+        if endpoint == "chat":
+            self._chat(json.loads(body or b"{}"))
+        else:
+            self._transcription(len(body))
+
+    def _ratelimit_headers(self, tokens: int = 0) -> dict:
+        return {
+            "x-ratelimit-remaining-requests": str(random.randint(0, RATELIMIT_REQUESTS)),
+            "x-ratelimit-remaining-tokens": str(max(0, RATELIMIT_TOKENS - tokens)),
+        }
+
+    def _chat(self, request: dict):
+        dishes = random.sample(CANNED_DISHES, random.randint(1, self.state.max_dishes))
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        if json_mode:
+            content = json.dumps({"dishes": dishes}, ensure_ascii=False)
+        else:
+            content = "\n".join(f"- Patiekalas: {dish}" for dish in dishes)
+
+        prompt = "".join(message.get("content", "") for message in request.get("messages", []))
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "stand-in")
+
+        if request.get("stream"):
+            self._stream_chat(completion_id, model, content, usage)
+            return
+
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }, self._ratelimit_headers(usage["total_tokens"]))
+
+    def _stream_chat(self, completion_id: str, model: str, content: str, usage: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in self._ratelimit_headers(usage["total_tokens"]).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        def event(delta: dict, finish_reason=None, extra=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            chunk.update(extra or {})
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        # Tokenų tempas: likęs vėlinimas paskirstomas dalims
+        pause = self.state.chat_latency() / max(1, len(content) / STREAM_CHUNK_CHARS)
+        self.close_connection = True
+        try:
+            event({"role": "assistant", "content": ""})
+            for start in range(0, len(content), STREAM_CHUNK_CHARS):
+                time.sleep(max(0.0, pause))
+                event({"content": content[start:start + STREAM_CHUNK_CHARS]})
+            event({}, "stop", {"x_groq": {"id": completion_id, "usage": usage}})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Klientas nutraukė srautą (pvz., pralaimėjęs hedging dublikatas)
+            self.state.count("chat_cancelled")
+
+    def _transcription(self, size: int):
+        duration = round(size / BYTES_PER_AUDIO_SECOND, 2)
+        self._send_json(200, {
+            "task": "transcribe",
+            "language": "lithuanian",
+            "duration": duration,
+            "text": CANNED_TRANSCRIPTION,
+            "segments": [],
+        }, self._ratelimit_headers())
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_server(args, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.state = StandInState(args)
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--chat-latency", type=parse_latency, default=parse_latency("lognormal:-1.2,0.4"),
+                        help="Pokalbio užklausos vėlinimas (numatyta ~0.3 s)")
+    parser.add_argument("--audio-latency", type=parse_latency, default=parse_latency("lognormal:-0.7,0.3"),
+                        help="Transkripcijos vėlinimas (numatyta ~0.5 s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 atsakymų dalis")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 atsakymų dalis")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sekundės 429 atsakymams")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Užstrigusių (lėtų) atsakymų dalis")
+    parser.add_argument("--slow-latency", type=parse_latency, default=parse_latency("fixed:10"),
+                        help="Papildomas lėtų atsakymų vėlinimas")
+    parser.add_argument("--max-dishes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    server = make_server(args, args.host, args.port)
+    print(f"Groq stand-in: http://{args.host}:{args.port}{CHAT_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Užklausos: {server.state.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Load generator: N concurrent users calling the real LLMClient / VoiceToText
+code against a Groq-compatible server (by default the local stand-in).
+
+    python tools/load_generator.py --users 8 --requests 50 --mode chat
+    python tools/load_generator.py --users 4 --duration 30 --mode transcription --start-standin
+    python tools/load_generator.py --start-standin --slow-rate 0.02 --requests 200 --hedge
+
+Every request uses a unique query / audio payload, so the response caches
+never answer it. Reports throughput, error rate and latency percentiles.
+"""
+
+import argparse
+import io
+import math
+import os
+import struct
+import sys
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.groq_standin import CHAT_PATH, DEFAULT_PORT, TRANSCRIPTION_PATH  # noqa: E402
+
+MODES = ("chat", "stream", "transcription")
+QUERY = "Šiandien vakare valgiau kebabą su česnakiniu padažu, ryte cepelinus su kiauliena"
+AUDIO_SECONDS = 4
+AUDIO_RATE = 16_000
+
+
+def percentile(sorted_values, fraction):
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def make_wav(seed: int) -> bytes:
+    """Silent 16 kHz mono WAV whose first sample differs per request."""
+    frames = bytearray(AUDIO_SECONDS * AUDIO_RATE * 2)
+    struct.pack_into("<h", frames, 0, seed % 32_000)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(AUDIO_RATE)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def make_call(mode: str, base: str, hedge_policy=None):
+    """Return call(i) -> error message or None, running the real client code."""
+    if mode in ("chat", "stream"):
+        from LLM import LLMClient
+        from responseCache import ResponseCache
+        client = LLMClient(
+            api_key="load-test", base_url=base + CHAT_PATH, cache=ResponseCache(None), hedge_policy=hedge_policy
+        )
+
+        def call(i):
+            query = f"{QUERY} #{i}"
+            if mode == "stream":
+                response = client.stream_dishes(query, lambda dish: None)
+            else:
+                response = client.call_llama_api(query)
+            return response.get("error")
+        return call
+
+    from transcriptionCache import TranscriptionCache
+    from voiceToText import VoiceToText
+    voice = VoiceToText(transcription_cache=TranscriptionCache(None))
+    voice.SetLanguage("Lithuanian")
+    voice.transcription_url = base + TRANSCRIPTION_PATH
+    voice.hedge_policy = hedge_policy
+
+    def call(i):
+        text = voice._run_transcription(make_wav(i))
+        return text if text.startswith("Klaida") else None
+    return call
+
+
+def run_load(call, users: int, requests_per_user: int | None, duration: float | None):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(sys.maxsize))
+    deadline = time.perf_counter() + duration if duration else None
+
+    def user():
+        done = 0
+        while True:
+            if requests_per_user is not None and done >= requests_per_user:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            with lock:
+                i = next(counter)
+            started = time.perf_counter()
+            error = call(i)
+            elapsed = time.perf_counter() - started
+            done += 1
+            with lock:
+                latencies.append(elapsed)
+                if error:
+                    errors.append(error)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, daemon=True) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def report(latencies, errors, wall):
+    if not latencies:
+        print("Užklausų neįvykdyta.")
+        return
+    values = sorted(latencies)
+    print(f"requests:   {len(values)}")
+    print(f"errors:     {len(errors)} ({len(errors) / len(values):.1%})")
+    print(f"throughput: {len(values) / wall:.1f} req/s")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}:        {percentile(values, fraction) * 1000:.0f} ms")
+    print(f"max:        {values[-1] * 1000:.0f} ms")
+    for message in sorted(set(errors))[:5]:
+        print(f"  {message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=f"http://127.0.0.1:{DEFAULT_PORT}",
+                        help="Serverio adresas be /openai/v1/... kelio")
+    parser.add_argument("--mode", choices=MODES, default="chat")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=None, help="Užklausų skaičius vienam vartotojui")
+    parser.add_argument("--duration", type=float, default=None, help="Trukmė sekundėmis")
+    parser.add_argument("--start-standin", action="store_true",
+                        help="Paleisti vietinį stand-in serverį šiame procese")
+    parser.add_argument("--metrics", action="store_true", help="Išspausdinti metrics registrą")
+    parser.add_argument("--hedge", action="store_true", help="Dubliuoti lėtas užklausas (hedging.py)")
+    parser.add_argument("--hedge-percentile", type=float, default=0.95)
+    parser.add_argument("--hedge-ratio", type=float, default=0.1, help="Didžiausia dublikatų dalis")
+    args, standin_argv = parser.parse_known_args(argv)
+    if args.requests is None and args.duration is None:
+        args.requests = 25
+
+    server = None
+    if args.start_standin:
+        from tools.groq_standin import build_parser, make_server
+        standin_args = build_parser().parse_args(standin_argv)
+        server = make_server(standin_args, standin_args.host, standin_args.port)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        args.base_url = f"http://{standin_args.host}:{standin_args.port}"
+    elif standin_argv:
+        parser.error(f"nežinomi argumentai: {' '.join(standin_argv)}")
+
+    hedge_policy = None
+    if args.hedge:
+        from hedging import HedgePolicy
+        hedge_policy = HedgePolicy(
+            args.mode, percentile=args.hedge_percentile, max_hedge_ratio=args.hedge_ratio,
+            max_workers=2 * args.users
+        )
+
+    try:
+        latencies, errors, wall = run_load(
+            make_call(args.mode, args.base_url, hedge_policy), args.users, args.requests, args.duration
+        )
+    finally:
+        if server is not None:
+            server.shutdown()
+            print(f"stand-in: {server.state.counts}")
+
+    report(latencies, errors, wall)
+    if hedge_policy is not None:
+        print(f"hedging: {hedge_policy.stats()}")
+        hedge_policy.shutdown()
+    if args.metrics:
+        from metrics import get_registry
+        print(get_registry().dump_prometheus())
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
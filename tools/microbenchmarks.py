@@ -0,0 +1,313 @@
+"""
+Offline microbenchmarks for the text, parsing and UI-building hot paths.
+
+    python tools/microbenchmarks.py run --output baseline.json
+    python tools/microbenchmarks.py run --output current.json --cases extract_dishes
+    python tools/microbenchmarks.py compare baseline.json current.json --threshold 0.25
+
+Each case is timed at every input size (1 to 10k dishes); the result is
+the best per-call time of several autoranged timeit repeats. The UI cases
+need Kivy and run against a headless window; they are skipped without it,
+or when sounddevice cannot load PortAudio (it raises OSError on import).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dishes import DishList  # noqa: E402
+from TranslationManager import translationManager  # noqa: E402
+from translations import TRANSLATIONS  # noqa: E402
+
+SIZES = (1, 10, 100, 1000, 10000)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+DISHES = [
+    "Cepelinai su kiauliena",
+    "Kava su pienu",
+    "Šaltibarščiai",
+    "Kebabas su česnakiniu padažu",
+    "Blynai su varške",
+]
+
+
+def dish_names(size):
+    return [f"{DISHES[i % len(DISHES)]} {i}" for i in range(size)]
+
+
+def llm_client():
+    import requests
+    from LLM import LLMClient
+    from responseCache import ResponseCache
+    # Jokio tinklo ir jokios talpyklos diske
+    return LLMClient(api_key="bench", session=requests.Session(), cache=ResponseCache(":memory:"))
+
+
+def case_process_response(size):
+    llm = llm_client()
+    response = {"dishes": DishList(dish_names(size))}
+    return lambda: llm.process_response(response)
+
+
+def case_extract_dishes(size):
+    llm = llm_client()
+    text = "Aptikti patiekalai:\n" + DishList(dish_names(size)).to_text()
+    return lambda: llm.extract_dishes(text)
+
+
+def case_format_dishes_output(size):
+    llm = llm_client()
+    names = dish_names(size)
+    return lambda: llm.format_dishes_output(names)
+
+
+def case_parse_llm_json(size):
+    # JSON atsakymo išskaidymas LLM sluoksnyje
+    content = DishList(dish_names(size)).to_json()
+    return lambda: DishList.from_json(content)
+
+
+def case_update_from_text(size):
+    # update_from_text: vartotojo redaguotas tekstas -> DishList
+    text = "Aptikti patiekalai:\n" + DishList(dish_names(size)).to_text()
+    return lambda: DishList.from_text(text)
+
+
+def case_translation_t(size):
+    translator = translationManager("lt")
+    keys = list(TRANSLATIONS["lt"])
+    calls = [keys[i % len(keys)] for i in range(size)]
+
+    def run():
+        for key in calls:
+            translator.t(key)
+    return run
+
+
+def _headless_kivy():
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ.setdefault("KIVY_NO_FILELOG", "1")
+    os.environ.setdefault("KIVY_GL_BACKEND", "mock")
+    from kivy.clock import Clock
+    from kivy.lang import Builder
+    from kivy.uix.label import Label
+
+    import ui.productRow  # noqa: F401 – registruoja ProductRow
+    Builder.load_string(
+        "<BenchList@RecycleView>:\n"
+        "    viewclass: 'ProductRow'\n"
+        "    size: 800, 600\n"
+        "    RecycleBoxLayout:\n"
+        "        orientation: 'vertical'\n"
+        "        default_size: None, 40\n"
+        "        default_size_hint: 1, None\n"
+        "        size_hint_y: None\n"
+        "        height: self.minimum_height\n"
+    )
+    from kivy.factory import Factory
+    return Clock, Factory.BenchList, Label
+
+
+@contextlib.contextmanager
+def _in_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def case_update_product_list(size):
+    Clock, BenchList, _ = _headless_kivy()
+    with _in_directory(os.path.join(ROOT, "ui")):
+        # mainScreen įkelia UI.kv santykiniu keliu
+        from ui import mainScreen
+
+    class Screen:
+        _row_data = mainScreen.MainScreen._row_data
+        update_product_list = mainScreen.MainScreen.update_product_list
+
+        def __init__(self):
+            self.ids = type("Ids", (), {"product_list": BenchList()})()
+            self.translator = translationManager("lt")
+
+        def edit_product(self, product_id):
+            pass
+
+        def confirm_delete(self, product_id):
+            pass
+
+    screen = Screen()
+    mainScreen.PRODUCTS = DishList(dish_names(size))
+
+    def run():
+        screen.update_product_list()
+        Clock.tick()
+    return run
+
+
+def _statistics_screen(size):
+    Clock, BenchList, Label = _headless_kivy()
+    from database.database import Database
+    from ui.statisticsScreen import StatisticsScreen
+
+    db = Database(":memory:")
+    db.add_products(dish_names(size))
+
+    class Screen:
+        load_statistics_data = StatisticsScreen.load_statistics_data
+        load_next_page = StatisticsScreen.load_next_page
+        _row_data = StatisticsScreen._row_data
+
+        def __init__(self):
+            self.ids = type("Ids", (), {"stats_list": BenchList(), "no_data_label": Label()})()
+            self.db = db
+            self.translator = translationManager("lt")
+            self.products = {}
+
+        def edit_product_by_id(self, product_id):
+            pass
+
+        def confirm_delete_popup(self, product_id):
+            pass
+
+        def show_error(self, message):
+            raise RuntimeError(message)
+
+    return Clock, Screen()
+
+
+def case_load_statistics_data(size):
+    Clock, screen = _statistics_screen(size)
+
+    def run():
+        screen.load_statistics_data("Visi")
+        Clock.tick()
+    return run
+
+
+def case_statistics_scroll_all(size):
+    # Visų puslapių įkėlimas, lyg vartotojas nuslinktų iki galo
+    Clock, screen = _statistics_screen(size)
+
+    def run():
+        screen.load_statistics_data("Visi")
+        while screen._has_more:
+            screen.load_next_page()
+        Clock.tick()
+    return run
+
+
+CASES = {
+    "process_response": case_process_response,
+    "extract_dishes": case_extract_dishes,
+    "format_dishes_output": case_format_dishes_output,
+    "parse_llm_json": case_parse_llm_json,
+    "update_from_text": case_update_from_text,
+    "translation_t": case_translation_t,
+    "update_product_list": case_update_product_list,
+    "load_statistics_data": case_load_statistics_data,
+    "statistics_scroll_all": case_statistics_scroll_all,
+}
+
+
+def measure(fn, repeat):
+    """Best per-call time in seconds over `repeat` autoranged timeit runs."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(cases, sizes, repeat, output):
+    results = {}
+    for name in cases:
+        for size in sizes:
+            try:
+                fn = CASES[name](size)
+            except (ImportError, OSError) as e:
+                # OSError: sounddevice be PortAudio (ui.mainScreen -> voiceToText)
+                print(f"{name}: praleista ({e})")
+                break
+            seconds = measure(fn, repeat)
+            results[f"{name}/{size}"] = seconds
+            print(f"{name:<24}{size:>8}{seconds * 1e6:>14.2f} us")
+
+    baseline = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as out:
+            json.dump(baseline, out, indent=2)
+        print(f"Išsaugota: {output}")
+
+
+def compare(baseline_path, current_path, threshold):
+    """Print per-case ratios; returns 1 if any case is slower than 1 + threshold."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(current_path, encoding="utf-8") as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'case':<34}{'baseline us':>14}{'current us':>14}{'ratio':>9}")
+    for key in sorted(baseline.keys() & current.keys()):
+        ratio = current[key] / baseline[key]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESIJA"
+            regressions += 1
+        print(f"{key:<34}{baseline[key] * 1e6:>14.2f}{current[key] * 1e6:>14.2f}{ratio:>9.2f}{flag}")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key:<34} nėra dabartiniame rezultate")
+
+    print(f"Regresijų: {regressions} (slenkstis {threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Paleisti matavimus")
+    run_parser.add_argument("--output", help="JSON rezultatų failas")
+    run_parser.add_argument("--cases", default=",".join(CASES),
+                            help="Kableliais atskirti atvejai")
+    run_parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+
+    compare_parser = commands.add_parser("compare", help="Palyginti su baziniu rezultatu")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        cases = [name.strip() for name in args.cases.split(",") if name.strip()]
+        unknown = [name for name in cases if name not in CASES]
+        if unknown:
+            parser.error(f"nežinomi atvejai: {', '.join(unknown)}")
+        sizes = [int(size) for size in args.sizes.split(",")]
+        run(cases, sizes, args.repeat, args.output)
+        return 0
+    return compare(args.baseline, args.current, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Per-stage latency report from tracing JSONL files (rotated files included).
+
+    python tools/trace_report.py traces.jsonl traces.jsonl.1
+"""
+
+import argparse
+import json
+import math
+from collections import defaultdict
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def load(paths):
+    durations = defaultdict(list)
+    errors = defaultdict(int)
+    traces = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as trace_file:
+            for line in trace_file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Rotacijos metu nutraukta eilutė
+                    continue
+                durations[record["name"]].append(record["duration_ms"])
+                traces.add(record["trace_id"])
+                if "error" in record:
+                    errors[record["name"]] += 1
+    return durations, errors, len(traces)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="traces.jsonl and its rotated copies")
+    args = parser.parse_args()
+
+    durations, errors, traces = load(args.paths)
+    if not durations:
+        print("Pėdsakų nerasta.")
+        return
+
+    print(f"traces: {traces}")
+    print(f"{'stage':<18}{'count':>8}{'errors':>8}{'p50 ms':>12}{'p95 ms':>12}{'max ms':>12}")
+    stages = sorted(durations, key=lambda name: -sum(durations[name]))
+    for name in stages:
+        values = sorted(durations[name])
+        print(
+            f"{name:<18}{len(values):>8}{errors[name]:>8}"
+            f"{percentile(values, 0.5):>12.1f}{percentile(values, 0.95):>12.1f}{values[-1]:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Lightweight pipeline tracing: nested spans written to a rotating JSONL file.
+
+Tracing is opt-in: nothing is recorded unless a sample rate is set, either
+with configure_tracing(sample_rate=...) or the TRACE_SAMPLE_RATE variable.
+The decision is taken once per root span, so a trace is kept or dropped
+as a whole. Spans nest through contextvars; code started in another thread
+joins the trace by running in a copied context (see JobExecutor) or by
+passing `parent=` explicitly.
+
+    with span("llm", model=MODEL):
+        ...
+
+    python tools/trace_report.py traces.jsonl
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+TRACE_PATH = "traces.jsonl"
+DEFAULT_MAX_BYTES = 5_000_000
+DEFAULT_BACKUP_COUNT = 3
+
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("current_span", default=None)
+_tracer: "Tracer | None" = None
+_lock = threading.Lock()
+
+
+class Span:
+    """One timed stage; `sampled` False means the span is a no-op."""
+
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name",
+                 "attrs", "start", "_started", "sampled", "ended")
+
+    def __init__(self, tracer, name: str, parent: "Span | None", sampled: bool, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.sampled = sampled
+        self.ended = False
+        if not sampled:
+            return
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attrs = attrs
+        self.start = time.time()
+        self._started = time.perf_counter()
+
+    def set(self, **attrs):
+        if self.sampled:
+            self.attrs.update(attrs)
+
+    def end(self, error: Exception | None = None):
+        if not self.sampled or self.ended:
+            return
+        self.ended = True
+        duration = time.perf_counter() - self._started
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(duration * 1000, 3),
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        if self.attrs:
+            record["attrs"] = self.attrs
+        self.tracer.write(record)
+
+
+class Tracer:
+    def __init__(
+        self,
+        path: str = TRACE_PATH,
+        sample_rate: float = 0.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._handler: RotatingFileHandler | None = None
+        self._handler_lock = threading.Lock()
+
+    def start_span(self, name: str, parent: Span | None = None, **attrs) -> Span:
+        """Start a span that the caller ends; it does not become the current span."""
+        if parent is None:
+            parent = _current.get()
+        if parent is not None:
+            sampled = parent.sampled
+        else:
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        return Span(self, name, parent, sampled, attrs)
+
+    def write(self, record: dict):
+        if self._handler is None:
+            with self._handler_lock:
+                if self._handler is None:
+                    # RotatingFileHandler rašo iš kelių gijų ir pasirūpina failų rotacija
+                    self._handler = RotatingFileHandler(
+                        self.path, maxBytes=self.max_bytes,
+                        backupCount=self.backup_count, encoding="utf-8", delay=True
+                    )
+        self._handler.emit(logging.makeLogRecord({"msg": json.dumps(record, ensure_ascii=False)}))
+
+    def close(self):
+        with self._handler_lock:
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _lock:
+            if _tracer is None:
+                _tracer = Tracer(
+                    os.getenv("TRACE_PATH", TRACE_PATH),
+                    float(os.getenv("TRACE_SAMPLE_RATE", "0") or 0)
+                )
+    return _tracer
+
+
+def configure_tracing(path: str = TRACE_PATH, sample_rate: float = 1.0, **kwargs) -> Tracer:
+    """Replace the shared tracer, e.g. configure_tracing(sample_rate=0.1)."""
+    global _tracer
+    with _lock:
+        old = _tracer
+        _tracer = Tracer(path, sample_rate, **kwargs)
+    if old is not None:
+        old.close()
+    return _tracer
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def start_span(name: str, parent: Span | None = None, **attrs) -> Span:
+    return get_tracer().start_span(name, parent, **attrs)
+
+
+@contextmanager
+def use_span(active: Span | None):
+    """Make an already started span current, so new spans nest under it."""
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, parent: Span | None = None, **attrs):
+    """Time the block as a child of `parent` or of the current span."""
+    current = start_span(name, parent, **attrs)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.end(e)
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
@@ -0,0 +1,59 @@
+import hashlib
+import io
+import threading
+
+from responseCache import DEFAULT_PATH, ResponseCache
+
+DEFAULT_DISK_BYTES = 5_000_000
+DEFAULT_MEMORY_ENTRIES = 32
+HASH_CHUNK_SIZE = 1 << 16
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def audio_key(audio, language: str) -> str:
+    """
+    Content address of an audio payload (bytes or a seekable file object)
+    plus the transcription language. File objects are rewound afterwards.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        digest.update(audio)
+    else:
+        position = audio.tell()
+        while chunk := audio.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        audio.seek(position, io.SEEK_SET)
+    return f"{language}:{digest.hexdigest()}"
+
+
+class TranscriptionCache(ResponseCache):
+    """
+    Whisper transcripts keyed by audio content, so identical audio is never
+    transcribed twice. Disk usage is bounded by `disk_bytes` with LRU eviction.
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_PATH,
+        disk_bytes: int = DEFAULT_DISK_BYTES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES
+    ):
+        super().__init__(
+            path,
+            memory_entries=memory_entries,
+            ttl=float("inf"),
+            table="transcriptions",
+            disk_bytes=disk_bytes
+        )
+
+
+def get_transcription_cache() -> TranscriptionCache:
+    """Shared cache used by VoiceToText when none is passed in."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = TranscriptionCache()
+    return _default_cache
@@ -22,6 +22,9 @@ TRANSLATIONS = {
         'filter_month': "This Month",
         'apply_changes': "Apply Changes",
         'recognized_products': "Recognized Products",
+        'retry_extraction': "Retry Recognition",
+        'processing': "Processing...",
+        'long_recording': "Long Recording",
     },
     'lt': {
         'start_recording': "Pradėti įrašymą",
@@ -46,5 +49,8 @@ TRANSLATIONS = {
         'filter_month': "Mėnuo",
         'apply_changes': "Įrašyti pakeitimus",
         'recognized_products': "Atpažinti produktai",
+        'retry_extraction': "Atpažinti iš naujo",
+        'processing': "Apdorojama...",
+        'long_recording': "Ilgas įrašas",
     }
 }
@@ -0,0 +1,81 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+
+
+class Job:
+    """Handle for a submitted job; long jobs check `cancelled` between stages."""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class JobExecutor:
+    """
+    Runs blocking work off the Kivy main thread. Results and errors are
+    posted back through Clock; a cancelled job never reaches its callbacks.
+    """
+
+    def __init__(self, max_workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, on_result, on_error=None):
+        """
+        Run fn(job) in the background; on_result(value) / on_error(exc) run on the main thread.
+        fn runs in a copy of the caller's context, so tracing spans nest across the thread hop.
+        """
+        job = Job()
+        context = contextvars.copy_context()
+
+        def deliver(callback, value):
+            def run(dt):
+                if not job.cancelled:
+                    callback(value)
+            Clock.schedule_once(run)
+
+        def run_job():
+            try:
+                value = fn(job)
+                if not job.cancelled:
+                    deliver(on_result, value)
+            except Exception as e:
+                print(f"Klaida vykdant užduotį: {e}")
+                if on_error is not None and not job.cancelled:
+                    deliver(on_error, e)
+            finally:
+                with self._lock:
+                    self._jobs.discard(job)
+
+        with self._lock:
+            self._jobs.add(job)
+            job.future = self._pool.submit(context.run, run_job)
+        return job
+
+    def cancel_all(self):
+        with self._lock:
+            jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+
+    @property
+    def busy(self):
+        with self._lock:
+            return bool(self._jobs)
+
+    def shutdown(self):
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
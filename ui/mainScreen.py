@@ -8,38 +8,73 @@ from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 
 from ui.statisticsScreen import StatisticsScreen
-from database.database import Database
-from LLM import send_query
+from database.database import get_database
+from dishes import DishList
+from LLM import LLMClient
+from localExtractor import LocalExtractor
 from voiceToText import VoiceToText
 from kivy.clock import Clock
+from ui.jobExecutor import JobExecutor
+from tracing import span, start_span, use_span
+from ui.productRow import ProductRow  # noqa: F401 – registruojama prieš įkeliant UI.kv
 
 from TranslationManager import translationManager
 
-PRODUCTS = []
-db = Database()
+PRODUCTS = DishList()
 Builder.load_file("UI.kv")
 
 
 class MainScreen(Screen):
-    def __init__(self, **kwargs):
+    def __init__(self, db=None, **kwargs):
         super(MainScreen, self).__init__(**kwargs)
+        self.db = db or get_database()
         self.voice_to_text = VoiceToText()
+        self.voice_to_text.streaming = True
         self.translator = translationManager('lt')  # Default language
+        self.llm = LLMClient(local_extractor=LocalExtractor.from_database(self.db))
+        self.jobs = JobExecutor()
+        # Pėdsakas nuo įrašymo mygtuko iki įrašymo į duomenų bazę
+        self.trace = None
+        # Vykdomos išgavimo užklausos tekstas – grąžinamas į lauką atšaukus
+        self.pending_query = None
+
+    def on_leave(self, *args):
+        # Išėjus iš ekrano nebelaukiame vykdomų užklausų
+        self.cancel_extraction()
+
+    def cancel_extraction(self):
+        """Cancel running jobs; returns True if an extraction's query was put back in the field."""
+        self.jobs.cancel_all()
+        query, self.pending_query = self.pending_query, None
+        if query is None:
+            return False
+        # Vietoj „Apdorojama...“ – vėl rodoma atšaukta užklausa
+        self.ids.transcription.text = query
+        return True
 
     def start_recording(self):
         if not self.voice_to_text.is_recording:
+            restored = self.cancel_extraction()
             self.ids.record_button.text = self.translator.t("stop_recording")
-            self.ids.transcription.text = self.translator.t("start_recording")
-            self.voice_to_text.start_recording(self.handle_transcription_result)
+            if not restored:
+                self.ids.transcription.text = self.translator.t("start_recording")
+            if self.trace is not None:
+                self.trace.end()
+            self.trace = start_span("pipeline")
+            with use_span(self.trace):
+                self.voice_to_text.start_recording(self.handle_transcription_result)
         else:
             self.ids.record_button.text = self.translator.t("start_recording")
             self.ids.transcription.text = self.translator.t("stop_recording")
             self.voice_to_text.is_recording = False
 
 
-    def handle_transcription_result(self, result):
+    def handle_transcription_result(self, result, partial=False):
         def update(dt):
             self.ids.transcription.text = result
+            if partial:
+                # Dalinis srauto tekstas – laukiame galutinio rezultato
+                return
             if "Klaida" not in result:
                 self.send_to_llm()
         Clock.schedule_once(update)
@@ -61,6 +96,8 @@ class MainScreen(Screen):
             "reports_button": "reports",
             "record_button": "start_recording",
             "apply_changes_button": "apply_changes",
+            "retry_button": "retry_extraction",
+            "long_recording_button": "long_recording",
             "recognized_label": "recognized_products"
         }.items():
             if btn_id in self.ids:
@@ -72,33 +109,75 @@ class MainScreen(Screen):
 
 
 
+    def set_long_recording(self, enabled):
+        # Keičiama tik tarp įrašų – vykstantis įrašas baigiamas senu režimu
+        self.voice_to_text.long_recording = enabled
+
+    def retry_extraction(self):
+        # Paskutinis transkribuotas tekstas imamas iš talpyklos – be garso įrašo
+        text = self.voice_to_text.cached_transcription()
+        if not text:
+            return
+        self.ids.transcription.text = text
+        self.send_to_llm()
+
     def clear_text(self):
         self.ids.transcription.text = ""
 
     def send_to_llm(self):
+        global PRODUCTS
         query = self.ids.transcription.text
+        self.jobs.cancel_all()
+        self.pending_query = query
+        self.ids.transcription.text = self.translator.t("processing")
+
+        # Naujas sąrašas – srauto eilučių veiksmai nelies ankstesnio sakinio patiekalų
+        PRODUCTS = DishList()
+        self.ids.product_list.data = []
+
+        def extract(job):
+            def on_dish(dish):
+                # Patiekalas rodomas sąraše, vos tik baigiama jo eilutė
+                def show(dt):
+                    if not job.cancelled:
+                        self.add_streamed_dish(dish)
+                Clock.schedule_once(show)
+
+            response = self.llm.stream_dishes(query, on_dish, lambda: job.cancelled)
+            if job.cancelled:
+                return None
+            return response
+
+        with use_span(self.trace):
+            self.jobs.submit(extract, self.display_results, self.handle_extraction_error)
+
+    def handle_extraction_error(self, error):
+        self.pending_query = None
         self.clear_text()
-        result = send_query(query)
-        self.display_results(result)
+        self.show_error(f"Klaida: {error}")
 
-    def display_results(self, result):
-        self.ids.transcription.text = result
-        self.save_to_products(result)
-        self.update_product_list()
-
-    def save_to_products(self, result):
-        PRODUCTS.clear()
-        lines = result.split("\n")
-        for idx, line in enumerate(lines, 1):
-            if line.strip().startswith("- Patiekalas:"):
-                name = line.split(":", 1)[1].strip()
-                PRODUCTS.append({"id": idx, "product_name": name})
+    def display_results(self, response):
+        global PRODUCTS
+        self.pending_query = None
+        if "error" in response:
+            PRODUCTS = DishList()
+            result = self.llm.process_response(response)
+        else:
+            # PRODUCTS užpildytas srauto metu – su jau atliktais pataisymais
+            result = self.llm.process_response({"dishes": PRODUCTS})
+        with span("widget_rebuild", parent=self.trace, rows=len(PRODUCTS)):
+            self.ids.transcription.text = result
+            self.update_product_list()
 
     def save_to_database(self):
         if not PRODUCTS:
             return
-        for product in PRODUCTS:
-            db.add_product(product["product_name"])
+        with span("db_write", parent=self.trace, rows=len(PRODUCTS)):
+            self.db.add_products(PRODUCTS.names())
+        self.llm.local_extractor.rebuild(self.db.get_dish_names())
+        if self.trace is not None:
+            self.trace.end()
+            self.trace = None
         self.ids.transcription.text = ""
         PRODUCTS.clear()
         self.update_product_list()
@@ -111,36 +190,32 @@ class MainScreen(Screen):
         ok_btn.bind(on_press=popup.dismiss)
         popup.open()
 
+    def _row_data(self, dish, delete_text):
+        return {
+            "product_id": dish.id,
+            "product_name": dish.name,
+            "delete_text": delete_text,
+            "edit_action": self.edit_product,
+            "delete_action": self.confirm_delete,
+        }
+
     def update_product_list(self):
-        product_list = self.ids.product_list
-        product_list.clear_widgets()
-        for product in PRODUCTS:
-            row = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
-
-            edit_btn = Button(
-                text=product["product_name"],
-                size_hint_y=None,
-                height=40,
-                on_press=lambda btn, pid=product["id"]: self.edit_product(pid)
-            )
-            del_btn = Button(
-                text=self.translator.t("delete"),
-                size_hint_x=None,
-                width=100,
-                height=40,
-                on_press=lambda btn, pid=product["id"]: self.confirm_delete(pid)
-            )
-            row.add_widget(edit_btn)
-            row.add_widget(del_btn)
-            product_list.add_widget(row)
+        # RecycleView perpanaudoja eilutes – keičiami tik duomenys
+        delete_text = self.translator.t("delete")
+        self.ids.product_list.data = [self._row_data(dish, delete_text) for dish in PRODUCTS]
+
+    def add_streamed_dish(self, dish):
+        # Eilutės id – iš PRODUCTS, kad redagavimas ir trynimas veiktų dar srautui nesibaigus
+        product = PRODUCTS.append(dish.name)
+        self.ids.product_list.data.append(self._row_data(product, self.translator.t("delete")))
 
     def edit_product(self, product_id):
-        product = next((p for p in PRODUCTS if p["id"] == product_id), None)
-        if not product:
+        dish = PRODUCTS.get(product_id)
+        if not dish:
             return
 
         self.product_input = TextInput(
-            text=product["product_name"],
+            text=dish.name,
             size_hint_y=None,
             height=40
         )
@@ -183,15 +258,17 @@ class MainScreen(Screen):
         if len(new_name) > 255:
             self.show_error("Pavadinimas negali viršyti 255 simbolių.")
             return
-        for product in PRODUCTS:
-            if product["id"] == product_id:
-                product["product_name"] = new_name
+        dish = PRODUCTS.get(product_id)
+        if dish is not None:
+            dish.name = new_name
         popup.dismiss()
         self.update_product_list()
 
     def confirm_delete(self, product_id):
-        product = next((p for p in PRODUCTS if p["id"] == product_id), None)
-        name = product["product_name"]
+        product = PRODUCTS.get(product_id)
+        if product is None:
+            return
+        name = product.name
 
         layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
         layout.add_widget(Label(text=f"Ar tikrai norite ištrinti {name}?"))
@@ -211,8 +288,7 @@ class MainScreen(Screen):
 
     def delete_product(self, product_id, name, popup):
         popup.dismiss()
-        global PRODUCTS
-        PRODUCTS = [p for p in PRODUCTS if p["id"] != product_id]
+        PRODUCTS.remove(product_id)
         self.update_product_list()
 
         layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
@@ -226,15 +302,7 @@ class MainScreen(Screen):
 
     def update_from_text(self):
         global PRODUCTS
-        PRODUCTS.clear()
-        self.ids.product_list.clear_widgets()
-        lines = self.ids.transcription.text.strip().split("\n")
-        id_counter = 1
-        for line in lines:
-            if line.strip().startswith("- Patiekalas:"):
-                name = line.split(":", 1)[1].strip()
-                PRODUCTS.append({"id": id_counter, "product_name": name})
-                id_counter += 1
+        PRODUCTS = DishList.from_text(self.ids.transcription.text)
         self.update_product_list()
 
     def show_error(self, message):
@@ -252,13 +320,17 @@ class MainScreen(Screen):
 
 class MyApp(App):
     def build(self):
-        self.db = db
+        # Vienas bendras saugyklos egzempliorius abiem ekranams
+        self.db = get_database()
         self.language = "Lithuanian"  # Store selected language globally
         sm = ScreenManager()
-        sm.add_widget(MainScreen(name="main"))
-        sm.add_widget(StatisticsScreen(name="statistics"))
+        sm.add_widget(MainScreen(name="main", db=self.db))
+        sm.add_widget(StatisticsScreen(name="statistics", db=self.db))
         return sm
 
+    def on_stop(self):
+        self.root.get_screen("main").jobs.shutdown()
+
 
 if __name__ == "__main__":
     MyApp().run()
@@ -0,0 +1,23 @@
+from kivy.properties import ObjectProperty, StringProperty
+from kivy.uix.boxlayout import BoxLayout
+
+
+class ProductRow(BoxLayout):
+    """
+    RecycleView row: product name button (edit) and a delete button.
+    Rows are reused, so all state comes from the data dict; the actions are
+    the screen's bound methods and receive the product id.
+    """
+    product_id = ObjectProperty(None)
+    product_name = StringProperty("")
+    delete_text = StringProperty("")
+    edit_action = ObjectProperty(None)
+    delete_action = ObjectProperty(None)
+
+    def on_edit(self):
+        if self.edit_action is not None:
+            self.edit_action(self.product_id)
+
+    def on_delete(self):
+        if self.delete_action is not None:
+            self.delete_action(self.product_id)
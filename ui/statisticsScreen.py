@@ -5,15 +5,29 @@ from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.screenmanager import Screen
 from kivy.app import App 
-from database.database import Database
+from database.database import get_database
 from TranslationManager import translationManager
-
-db = Database()
+from ui.productRow import ProductRow  # noqa: F401 – RecycleView eilutės klasė
+
+PAGE_SIZE = 50
+# Kitas puslapis kraunamas, kai iki sąrašo galo lieka mažiau nei tiek (scroll_y)
+LOAD_MORE_THRESHOLD = 0.1
+FILTER_PERIODS = {
+    'Visi': "all",
+    'Diena': "today",
+    'Savaitė': "week",
+    'Mėnuo': "month",
+}
 
 class StatisticsScreen(Screen):
-    def __init__(self, **kwargs):
+    def __init__(self, db=None, **kwargs):
         super().__init__(**kwargs)
+        self.db = db or get_database()
         self.translator = translationManager('lt')
+        self.products = {}
+        self._period = "all"
+        self._cursor = None
+        self._has_more = False
 
     def set_language(self, language):
         lang_code = 'lt' if language == 'Lithuanian' else 'en'
@@ -47,51 +61,55 @@ class StatisticsScreen(Screen):
 
 
     def load_statistics_data(self, filter_type):
-        stats_list = self.ids.stats_list
-        stats_list.clear_widgets()
-
+        self.ids.stats_list.data = []
+        self.products = {}
+        self.ids.no_data_label.text = ""
+        self._period = FILTER_PERIODS.get(filter_type, "all")
+        self._cursor = None
+        self._has_more = True
+
+        self.load_next_page()
+        if not self.products:
+            self.ids.no_data_label.text = self.translator.t("no_data")
+
+    def load_next_page(self):
+        if not self._has_more:
+            return
         try:
-            if filter_type == 'Visi':
-                products = db.get_all_products()
-            elif filter_type == 'Diena':
-                products = db.get_products_today()
-            elif filter_type == 'Savaitė':
-                products = db.get_products_this_week()
-            elif filter_type == 'Mėnuo':
-                products = db.get_products_this_month()
-            else:
-                products = []
-
-            if products is None:
-                stats_list.add_widget(Label(
-                    text=self.translator.t("no_data"),
-                    size_hint_y=None,
-                    height=40
-                ))
-                return
-
-            for product in products:
-                row = BoxLayout(size_hint_y=None, height=40, spacing=10)
-
-                product_button = Button(
-                    text=product['product_name'],
-                    on_press=lambda btn, p=product: self.edit_product(p)
-                )
-
-                delete_button = Button(
-                    text=self.translator.t("delete"),
-                    size_hint_x=None,
-                    width=100,
-                    on_press=lambda btn, p_id=product['id']: self.confirm_delete_popup(p_id)
-                )
-
-                row.add_widget(product_button)
-                row.add_widget(delete_button)
-                stats_list.add_widget(row)
-
+            products, self._cursor = self.db.get_products_page(self._period, self._cursor, PAGE_SIZE)
         except Exception as e:
+            self._has_more = False
             self.show_error("Nepavyko užkrauti duomenų. Bandykite dar kartą.")
             print(f"Klaida įkeliant statistiką: {e}")
+            return
+
+        self._has_more = self._cursor is not None
+        # RecycleView laiko tik matomas eilutes – čia kuriami tik duomenys
+        delete_text = self.translator.t("delete")
+        rows = []
+        for product in products:
+            self.products[product['id']] = product
+            rows.append(self._row_data(product, delete_text))
+        self.ids.stats_list.data.extend(rows)
+
+    def on_stats_scroll(self, scroll_y):
+        if self._has_more and scroll_y <= LOAD_MORE_THRESHOLD:
+            self.load_next_page()
+
+    def _row_data(self, product, delete_text):
+        return {
+            "product_id": product['id'],
+            "product_name": product['product_name'],
+            "delete_text": delete_text,
+            "edit_action": self.edit_product_by_id,
+            "delete_action": self.confirm_delete_popup,
+        }
+
+    def _row_index(self, product_id):
+        for index, row in enumerate(self.ids.stats_list.data):
+            if row["product_id"] == product_id:
+                return index
+        return None
 
     def show_error(self, message):
         content = BoxLayout(orientation="vertical", padding=10, spacing=10)
@@ -141,11 +159,19 @@ class StatisticsScreen(Screen):
         popup.open()
 
     def _delete_and_close(self, product_id, popup):
-        db.delete_product(product_id)
+        self.db.delete_product(product_id)
         popup.dismiss()
-        self.set_filter(self.ids.spinner.text)
+        self.products.pop(product_id, None)
+        index = self._row_index(product_id)
+        if index is not None:
+            self.ids.stats_list.data.pop(index)
         self.show_confirmation(self.translator.t("deleted"))
 
+    def edit_product_by_id(self, product_id):
+        product = self.products.get(product_id)
+        if product is not None:
+            self.edit_product(product)
+
     def edit_product(self, product):
         content = BoxLayout(orientation="vertical", spacing=10, padding=10)
         name_input = TextInput(text=product['product_name'])
@@ -161,8 +187,12 @@ class StatisticsScreen(Screen):
                 self.show_error("Pavadinimas negali viršyti 255 simbolių.")
                 return
 
-            db.update_product(product['id'], new_name)
-            self.set_filter(self.ids.spinner.text)
+            self.db.update_product(product['id'], new_name)
+            self.products[product['id']] = {**product, 'product_name': new_name}
+            index = self._row_index(product['id'])
+            if index is not None:
+                stats_list = self.ids.stats_list
+                stats_list.data[index] = {**stats_list.data[index], "product_name": new_name}
             popup.dismiss()
             self.show_confirmation(self.translator.t("edited"))
 
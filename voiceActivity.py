@@ -0,0 +1,99 @@
+import numpy as np
+
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+DEFAULT_GAIN = 10.0
+BLOCK_SECONDS = 0.02
+# Senasis fiksuotas slenkstis – tyla po stiprinimo niekada nelaikoma kalba žemiau jo
+MIN_THRESHOLD = 500.0
+SNR_RATIO = 3.0
+HANGOVER_SECONDS = 0.3
+# Triukšmo lygis seka minimumą: greitai krenta, lėtai kyla (~4 s 20 ms blokams),
+# bet kyla tik tyloje – kalbos ir hangover metu jis nekyla
+NOISE_FALL_RATE = 0.3
+NOISE_RISE_RATE = 0.005
+
+
+class VoiceActivityDetector:
+    """
+    Gain stage and frame-level energy VAD for the sounddevice callback.
+
+    Every block is amplified, clipped and measured in a preallocated float32
+    scratch buffer and written straight into the caller's int16 slot, so the
+    callback allocates no sample-sized arrays (only ~1 KB of numpy call
+    overhead per block). Speech is detected against a
+    noise floor that falls with the signal minimum in every block but only
+    rises outside speech, and held for a short hangover so word gaps are not
+    treated as silence.
+    """
+
+    def __init__(self, sample_rate: int, channels: int,
+                 gain: float = DEFAULT_GAIN,
+                 min_threshold: float = MIN_THRESHOLD,
+                 snr_ratio: float = SNR_RATIO,
+                 hangover_seconds: float = HANGOVER_SECONDS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = max(1, int(sample_rate * BLOCK_SECONDS))
+        self.gain = np.float32(gain)
+        self.min_threshold = min_threshold
+        self.snr_ratio = snr_ratio
+        self.noise_floor = min_threshold / snr_ratio
+        self.hangover_frames = int(sample_rate * hangover_seconds)
+        self.is_speech = False
+        self.rms = 0.0
+        self.silent_frames = 0
+        self._hangover_left = 0
+        self._scratch = np.empty((self.block_size, channels), dtype=np.float32)
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_threshold, self.noise_floor * self.snr_ratio)
+
+    @property
+    def silence_seconds(self) -> float:
+        """How long the signal has been continuously classified as non-speech."""
+        return self.silent_frames / float(self.sample_rate)
+
+    def process(self, indata: np.ndarray, out: np.ndarray) -> bool:
+        """
+        Amplify `indata` into the int16 slot `out` and classify the block.
+        Returns True while speech (or its hangover) is active.
+        """
+        frames = len(indata)
+        if frames > len(self._scratch):
+            self._scratch = np.empty((frames, self.channels), dtype=np.float32)
+        scratch = self._scratch[:frames]
+
+        # int16 -> float32 per copyto, ne per multiply: ufunc'as mišriems tipams skiria konvertavimo buferį
+        np.copyto(scratch, indata, casting='unsafe')
+        np.multiply(scratch, self.gain, out=scratch)
+        np.clip(scratch, INT16_MIN, INT16_MAX, out=scratch)
+        np.copyto(out, scratch[:len(out)], casting='unsafe')
+
+        flat = scratch.reshape(-1)
+        self.rms = float(np.sqrt(np.dot(flat, flat) / max(flat.size, 1)))
+        self._classify(frames)
+        return self.is_speech
+
+    def _track_noise(self):
+        if self.rms < self.noise_floor:
+            self.noise_floor += NOISE_FALL_RATE * (self.rms - self.noise_floor)
+        elif not self.is_speech:
+            # Ištisinės kalbos lygis kitaip pamažu taptų „triukšmu“ ir įrašas nutrūktų
+            self.noise_floor += NOISE_RISE_RATE * (self.rms - self.noise_floor)
+
+    def _classify(self, frames: int):
+        self._track_noise()
+        if self.rms >= self.threshold:
+            self.is_speech = True
+            self._hangover_left = self.hangover_frames
+            self.silent_frames = 0
+        elif self._hangover_left > 0:
+            self.is_speech = True
+            self._hangover_left -= frames
+            self.silent_frames = 0
+        else:
+            self.is_speech = False
+            self.silent_frames += frames
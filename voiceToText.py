@@ -14,30 +14,239 @@ voiceToText.py - SU TIKRAIS CODE SMELLS
 """
 
 import sounddevice as sd
+import contextvars
+import hashlib
 import wave
 import threading
-import numpy as np
-from groq import Groq
+from concurrent.futures import ThreadPoolExecutor
 from kivy.clock import Clock
 import time
 import os
 from dotenv import load_dotenv
 
+from audioBuffer import AudioBuffer
+from audioEncoding import TARGET_SAMPLE_RATE, encode_for_upload, upload_format
+from hedging import HedgePolicy
+from httpSession import get_session, prewarm
+from metrics import record_audio, record_error, record_lookup, record_response
+from tracing import span
+from transcriptionCache import TranscriptionCache, audio_key, get_transcription_cache
+from voiceActivity import VoiceActivityDetector
+
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
 
+MAX_RECORDING_SECONDS = 30
+MAX_FILE_SIZE_BYTES = 6_000_000
+TRANSCRIPTION_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
+TRANSCRIPTION_MODEL = "whisper-large-v3-turbo"
+
+# Srautinio režimo segmentavimas: segmentas uždaromas po tokios tylos trukmės
+SEGMENT_SILENCE_SECONDS = 0.6
+MIN_SEGMENT_SECONDS = 1.0
+# Nepavykęs segmentas siunčiamas dar tiek kartų, kol laikomas prarastu
+SEGMENT_RETRIES = 1
+
+# Ilgo įrašo režimas: segmentai kerpami tylose ir transkribuojami lygiagrečiai.
+# 120 s 16 kHz mono WAV – ~3.8 MB, t. y. mažiau nei MAX_FILE_SIZE_BYTES
+MAX_LONG_RECORDING_SECONDS = 600
+LONG_MIN_SEGMENT_SECONDS = 10.0
+LONG_MAX_SEGMENT_SECONDS = 120.0
+LONG_SILENCE_STOP_SECONDS = 6.0
+LONG_RECORDING_WORKERS = 4
+
+
+class SegmentError(Exception):
+    """A segment whose transcription failed after all retries."""
+
+    def __init__(self, start_seconds, end_seconds, message):
+        super().__init__(message)
+        self.start_seconds = start_seconds
+        self.end_seconds = end_seconds
+
+    @property
+    def marker(self):
+        """Placeholder for the lost segment in the stitched text."""
+        start, end = (divmod(int(value), 60) for value in (self.start_seconds, self.end_seconds))
+        return f"[Klaida: nepavyko transkribuoti {start[0]:02d}:{start[1]:02d}–{end[0]:02d}:{end[1]:02d}]"
+
+
+class SegmentStreamer:
+    """
+    Splits the recording into segments at silence boundaries and
+    transcribes closed segments on a pool of `workers` threads; the text is
+    stitched back in recording order. Segments longer than
+    `max_segment_seconds` are cut even without a pause, so each upload stays
+    under the API limits. `encode` turns a segment's samples into the payload.
+
+    A segment that still fails after SEGMENT_RETRIES is never dropped
+    silently: it appears in `text` as a SegmentError marker and is counted
+    in `failed`, so callers can fall back or report it. `transcript` is the
+    same text without the markers.
+    """
+    
+    def __init__(self, audio, transcribe, on_partial, encode, workers=1,
+                 min_segment_seconds=MIN_SEGMENT_SECONDS, max_segment_seconds=None):
+        self._audio = audio
+        self._transcribe = transcribe
+        self._encode = encode
+        self._on_partial = on_partial
+        self._min_frames = int(min_segment_seconds * audio.sample_rate)
+        self._max_frames = int(max_segment_seconds * audio.sample_rate) if max_segment_seconds else None
+        self._start = 0
+        self._voiced = False
+        self._parts = []
+        # Segmentų įkėlimų santraukos įrašo tvarka – iš jų sudaromas viso įrašo raktas
+        self._digests = []
+        self._published = ""
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment")
+    
+    @property
+    def text(self):
+        """Text of the leading segments that are already transcribed, in order."""
+        with self._lock:
+            return self._joined()
+    
+    @property
+    def transcript(self):
+        """Like `text`, but failed segments are left out instead of marked."""
+        with self._lock:
+            return self._joined(markers=False)
+    
+    def _joined(self, markers=True):
+        texts = []
+        for part in self._parts:
+            if not part.done():
+                break
+            error = part.exception()
+            if error is None:
+                texts.append(part.result())
+            elif markers and isinstance(error, SegmentError):
+                texts.append(error.marker)
+        return " ".join(text for text in texts if text)
+    
+    @property
+    def segments(self):
+        with self._lock:
+            return len(self._parts)
+    
+    def key(self, language):
+        """Cache key of the whole recording, derived from the segment payloads."""
+        with self._lock:
+            return audio_key(b"".join(self._digests), language)
+    
+    @property
+    def failed(self):
+        """Number of segments whose transcription failed (final after close())."""
+        with self._lock:
+            return sum(1 for part in self._parts if part.done() and part.exception() is not None)
+    
+    def feed(self, is_silent, silence_seconds):
+        """Called from the audio callback after each block is appended to the buffer."""
+        length = self._audio.frames - self._start
+        if not is_silent:
+            self._voiced = True
+        if self._max_frames is not None and length >= self._max_frames:
+            if self._voiced:
+                self._cut()
+            else:
+                # Vien tyla – nesiunčiama
+                self._start = self._audio.frames
+        elif (is_silent
+              and self._voiced
+              and silence_seconds >= SEGMENT_SILENCE_SECONDS
+              and length >= self._min_frames):
+            self._cut()
+    
+    def close(self):
+        """Flush the last segment, wait for pending transcriptions and return the full text."""
+        if self._voiced:
+            self._cut()
+        self._pool.shutdown(wait=True)
+        return self.text
+    
+    def _cut(self):
+        end = self._audio.frames
+        with self._lock:
+            index = len(self._digests)
+            self._digests.append(b"")
+        # Segmentų transkripcijos priklauso tam pačiam pėdsakui (trace)
+        part = self._pool.submit(
+            contextvars.copy_context().run, self._transcribe_segment, index, self._start, end
+        )
+        with self._lock:
+            self._parts.append(part)
+        part.add_done_callback(self._publish)
+        self._start = end
+        self._voiced = False
+    
+    def _transcribe_segment(self, index, start, end):
+        payload = self._encode(self._audio.samples(start, end))
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        with self._lock:
+            self._digests[index] = digest
+        for _ in range(SEGMENT_RETRIES + 1):
+            text = self._transcribe(payload)
+            if not text.startswith("Klaida"):
+                return text.strip()
+            print(text)
+        rate = float(self._audio.sample_rate)
+        raise SegmentError(start / rate, end / rate, text)
+    
+    def _publish(self, part):
+        # Po užrakto, kad dalinis tekstas niekada negrįžtų į senesnę būseną
+        with self._lock:
+            text = self._joined()
+            if text == self._published:
+                return
+            self._published = text
+            self._on_partial(text)
+
 
 class VoiceToText:
     """Voice to text transcription class"""
     
-    def __init__(self):
+    def __init__(self, transcription_cache: TranscriptionCache | None = None):
         self.is_recording = False
         self.recording_thread = None
-        # ⚠️ CODE SMELL #1: Duplicate string literal (S1192)
-        # "temp.wav" kartojasi 5+ kartus faile
-        self.audio_file_path = "temp.wav"
         self.language_code = 'en'
-        self.client = Groq(api_key=API_KEY)
+        # Srautinis režimas: dalinis tekstas perduodamas callback(text, partial=True)
+        self.streaming = False
+        # Jungtis paruošiama kol vartotojas kalba
+        self.prewarm_connection = True
+        self.transcription_url = TRANSCRIPTION_URL
+        # Bendra sesija imama kiekvieną kartą, kad galiotų configure_session
+        self._session = None
+        # Bendra talpykla atidaroma tik pirmą kartą jos prireikus – ne kuriant objektą
+        self._transcription_cache = transcription_cache
+        self.last_transcription_key = None
+        # Įkeliama 16 kHz mono; FLAC, jei įdiegtas soundfile
+        self.upload_sample_rate = TARGET_SAMPLE_RATE
+        self.compress_uploads = True
+        # Ilgas įrašas: iki MAX_LONG_RECORDING_SECONDS, pauzės tarp sakinių leidžiamos
+        self.long_recording = False
+        self.segment_workers = LONG_RECORDING_WORKERS
+        # Neprivaloma: lėti įkėlimai dubliuojami (žr. hedging.py)
+        self.hedge_policy: HedgePolicy | None = None
+    
+    @property
+    def session(self):
+        return self._session or get_session()
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+    
+    @property
+    def transcription_cache(self) -> TranscriptionCache:
+        if self._transcription_cache is None:
+            self._transcription_cache = get_transcription_cache()
+        return self._transcription_cache
+
+    @transcription_cache.setter
+    def transcription_cache(self, cache: TranscriptionCache):
+        self._transcription_cache = cache
     
     # ⚠️ CODE SMELL #2: Function name not matching convention (S100)
     # Should be snake_case, not camelCase
@@ -46,13 +255,16 @@ class VoiceToText:
         if not self.is_recording:
             self.is_recording = True
             self.recording_thread = threading.Thread(
-                target=self._record_audio,
-                args=(callback,)
+                target=contextvars.copy_context().run,
+                args=(self._record_audio, callback)
             )
             self.recording_thread.start()
         else:
             self.is_recording = False
     
+    # MainScreen kviečia snake_case vardus; camelCase lieka kaip S100 pavyzdys
+    start_recording = StartRecording
+    
     def _record_audio(self, callback):
         """
         ⚠️ CODE SMELL #3: Cognitive Complexity too high (S3776)
@@ -62,7 +274,8 @@ class VoiceToText:
         Target: CogC > 15 (SonarCloud threshold)
         """
         try:
-            device_info = sd.query_devices(kind='input')
+            with span("device_query"):
+                device_info = sd.query_devices(kind='input')
             sample_rate = int(device_info['default_samplerate'])
             channels = device_info['max_input_channels']
             
@@ -70,62 +283,78 @@ class VoiceToText:
             if channels < 1:
                 raise ValueError("Mikrofono klaida")
             
-            # ⚠️ DUPLICATE LITERAL: "temp.wav"
-            filename = "temp.wav"
+            if self.prewarm_connection:
+                prewarm(self.session, self.transcription_url)
             
-            # ⚠️ MAGIC NUMBERS: 500, 2.0 (should be constants)
-            silence_threshold = 500
+            # ⚠️ MAGIC NUMBER: 2.0 (should be constant)
             silence_duration_limit = 2.0
-            silence_start_time = None
+            silence_announced = False
+            long_recording = self.long_recording
+            max_seconds = MAX_LONG_RECORDING_SECONDS if long_recording else MAX_RECORDING_SECONDS
+            if long_recording:
+                silence_duration_limit = LONG_SILENCE_STOP_SECONDS
+            
+            # Įrašas laikomas atmintyje – jokio temp.wav failo
+            audio = AudioBuffer(sample_rate, channels, max_seconds + 1)
+            vad = VoiceActivityDetector(sample_rate, channels)
+            
+            def on_partial(text):
+                if self.streaming:
+                    Clock.schedule_once(lambda dt: callback(text, partial=True))
+            
+            def encode(samples):
+                return self._encode_upload(samples, sample_rate)
             
-            # ⚠️ DUPLICATE LITERAL: "temp.wav"
-            with wave.open("temp.wav", 'wb') as wf:
-                wf.setnchannels(channels)
-                # ⚠️ MAGIC NUMBER: 2
-                wf.setsampwidth(2)
-                wf.setframerate(sample_rate)
+            streamer = None
+            if long_recording:
+                streamer = SegmentStreamer(
+                    audio, self._run_transcription, on_partial, encode,
+                    workers=self.segment_workers,
+                    min_segment_seconds=LONG_MIN_SEGMENT_SECONDS,
+                    max_segment_seconds=LONG_MAX_SEGMENT_SECONDS
+                )
+            elif self.streaming:
+                streamer = SegmentStreamer(audio, self._run_transcription, on_partial, encode)
+            
+            def audio_callback(indata, frames, time_info, status):
+                nonlocal silence_announced
                 
-                def audio_callback(indata, frames, time_info, status):
-                    nonlocal silence_start_time
-                    
-                    # ⚠️ CODE SMELL #6: Unused variable (S1481)
-                    unused_var = "This is never used"
-                    
-                    if status:
-                        # ⚠️ DUPLICATE LITERAL: repeated print pattern
-                        print(f"Įrašinėjimo statusas: {status}")
-                    
-                    # ⚠️ MAGIC NUMBER: 10.0
-                    gain = 10.0
-                    
-                    # ⚠️ MAGIC NUMBERS: -32768, 32767
-                    amplified_data = np.clip(indata * gain, -32768, 32767).astype(np.int16)
-                    wf.writeframes(amplified_data.tobytes())
-                    
-                    # ⚠️ COGNITIVE COMPLEXITY: nested ifs (+4 complexity)
-                    rms = np.sqrt(np.mean(amplified_data.astype(np.float32) ** 2))
-                    is_silent = rms < silence_threshold
-                    
-                    if not is_silent:
-                        silence_start_time = None
+                # ⚠️ CODE SMELL #6: Unused variable (S1481)
+                unused_var = "This is never used"
+                
+                if status:
+                    # ⚠️ DUPLICATE LITERAL: repeated print pattern
+                    print(f"Įrašinėjimo statusas: {status}")
+                
+                # Stiprinimas ir VAD be naujų masyvų – rašoma tiesiai į buferį
+                is_silent = not vad.process(indata, audio.claim(frames))
+                
+                # ⚠️ COGNITIVE COMPLEXITY: nested ifs (+4 complexity)
+                if not is_silent:
+                    silence_announced = False
+                else:
+                    if not silence_announced:
+                        silence_announced = True
+                        print("🤫 Tyla aptikta...")
                     else:
-                        if silence_start_time is None:
-                            silence_start_time = time.time()
-                            print("🤫 Tyla aptikta...")
-                        else:
-                            if time.time() - silence_start_time >= silence_duration_limit:
-                                print("🛑 Aptikta tyla – stabdome įrašymą.")
-                                self.is_recording = False
-                                if not self.is_recording:
-                                    raise sd.CallbackStop()
-                    
-                    if not self.is_recording:
-                        raise sd.CallbackStop()
+                        if vad.silence_seconds >= silence_duration_limit:
+                            print("🛑 Aptikta tyla – stabdome įrašymą.")
+                            self.is_recording = False
+                            if not self.is_recording:
+                                raise sd.CallbackStop()
+                
+                if streamer is not None:
+                    streamer.feed(is_silent, vad.silence_seconds)
                 
-                with sd.InputStream(
+                if not self.is_recording:
+                    raise sd.CallbackStop()
+            
+            try:
+                with span("capture", sample_rate=sample_rate, channels=channels), sd.InputStream(
                     samplerate=sample_rate,
                     channels=channels,
                     dtype='int16',
+                    blocksize=vad.block_size,
                     callback=audio_callback
                 ):
                     print("🔴 Įrašymas pradėtas (kalbėkite)...")
@@ -135,44 +364,70 @@ class VoiceToText:
                         # ⚠️ MAGIC NUMBER: 200
                         sd.sleep(200)
                         
-                        # ⚠️ MAGIC NUMBER: 30
-                        if time.time() - start_time > 30:
+                        if time.time() - start_time > max_seconds:
                             self.is_recording = False
+                            if long_recording:
+                                # Ilgas įrašas baigiamas ties riba, jau įrašyta dalis transkribuojama
+                                print("🛑 Pasiekta ilgo įrašo riba – stabdome įrašymą.")
+                                break
                             # ⚠️ DUPLICATE LITERAL: repeated error message
                             raise ValueError("Įrašymas per ilgas (max 30s)")
+            finally:
+                # Srauto metu segmentai jau transkribuoti – belieka sulaukti paskutinio
+                streamed_text = streamer.close() if streamer is not None else None
             
-            # ⚠️ DUPLICATE LITERAL: "temp.wav" again
-            if self._is_audio_file_empty("temp.wav"):
-                # ⚠️ DUPLICATE LITERAL: repeated error message
-                raise ValueError("Audio failas tuščias. Įrašymo klaida!")
-            
-            # ⚠️ DUPLICATE LITERAL: "temp.wav"
-            recording_length = self._get_audio_length("temp.wav")
-            
-            # ⚠️ MAGIC NUMBERS: 30, 3
-            if recording_length > 30:
-                # ⚠️ DUPLICATE LITERAL: "Įrašymas per ilgas"
-                raise ValueError(
-                    f"Įrašymas per ilgas: ({recording_length:.2f} s). Max 30s."
-                )
+            with span("validation", seconds=audio.duration):
+                if audio.is_empty:
+                    # ⚠️ DUPLICATE LITERAL: repeated error message
+                    raise ValueError("Audio failas tuščias. Įrašymo klaida!")
+                
+                recording_length = audio.duration
+                
+                if recording_length > max_seconds:
+                    # ⚠️ DUPLICATE LITERAL: "Įrašymas per ilgas"
+                    raise ValueError(
+                        f"Įrašymas per ilgas: ({recording_length:.2f} s). Max {max_seconds}s."
+                    )
+                
+                # ⚠️ MAGIC NUMBER: 3
+                if recording_length < 3:
+                    # ⚠️ DUPLICATE LITERAL: error message pattern
+                    raise ValueError(
+                        f"Įrašymas per trumpas: ({recording_length:.2f} s). Min 3s."
+                    )
             
-            if recording_length < 3:
-                # ⚠️ DUPLICATE LITERAL: error message pattern
-                raise ValueError(
-                    f"Įrašymas per trumpas: ({recording_length:.2f} s). Min 3s."
-                )
+            if long_recording:
+                # Segmentai jau išsiųsti atskirai – visas įrašas neperkoduojamas
+                result = streamer.transcript
+                if not result:
+                    raise ValueError("Nepavyko transkribuoti nė vieno segmento")
+                failed = streamer.failed
+                if failed:
+                    # Per ilgas vienam įkėlimui: patiekalai ištraukiami iš pavykusių
+                    # segmentų, o dalinis tekstas talpinamas, kad veiktų retry_extraction
+                    print(f"Nepavyko transkribuoti {failed} iš {streamer.segments} segmentų – jie praleidžiami")
+                self._remember_transcription(streamer.key(self.language_code), result)
+                Clock.schedule_once(lambda dt: callback(result))
+                return
             
-            # ⚠️ DUPLICATE LITERAL: "temp.wav"
-            too_large, file_size_bytes = self.check_file_size("temp.wav")
+            with span("encode", source_bytes=audio.size) as encode_span:
+                payload = self._encode_upload(audio.samples(), sample_rate)
+                encode_span.set(bytes=len(payload))
             
-            if too_large:
+            if len(payload) > MAX_FILE_SIZE_BYTES:
                 # ⚠️ MAGIC NUMBER: 1024, 6
                 raise ValueError(
-                    f"Failo dydis per didelis: ({file_size_bytes / 1024:.2f} KB). "
+                    f"Failo dydis per didelis: ({len(payload) / 1024:.2f} KB). "
                     f"Max leidžiamas dydis – 6 MB."
                 )
             
-            result = self._run_transcription()
+            if streamed_text and not streamer.failed:
+                result = streamed_text
+                # Visas įrašas talpykloje – ištraukimą galima kartoti be garso
+                self._remember_transcription(audio_key(payload, self.language_code), result)
+            else:
+                # Be srauto arba kai segmentas neatpažintas – siunčiamas visas įrašas
+                result = self._run_transcription(payload)
             Clock.schedule_once(lambda dt: callback(result))
         
         except Exception as e:
@@ -233,33 +488,88 @@ class VoiceToText:
             # ⚠️ MAGIC NUMBER: 0
             return 0
     
-    def _run_transcription(self):
+    def _encode_upload(self, samples, sample_rate):
+        """Captured int16 samples -> 16 kHz mono FLAC/WAV upload payload."""
+        return encode_for_upload(
+            samples, sample_rate, self.upload_sample_rate, self.compress_uploads
+        )
+    
+    def cached_transcription(self):
+        """Transcript of the last recording, if it is still in the cache"""
+        if self.last_transcription_key is None:
+            return None
+        return self.transcription_cache.get(self.last_transcription_key)
+    
+    def _remember_transcription(self, key, text):
+        if text.strip():
+            self.transcription_cache.set(key, text)
+        self.last_transcription_key = key
+    
+    def _run_transcription(self, audio):
+        """
+        Run Whisper transcription on WAV bytes or a file object.
+        Identical audio in the same language is served from the cache.
+        """
+        key = audio_key(audio, self.language_code)
+        cached = self.transcription_cache.get(key)
+        if cached is not None:
+            self.last_transcription_key = key
+            record_lookup("transcription", "cache")
+            return cached
+        
+        record_lookup("transcription", "api")
+        text = self._request_transcription(audio)
+        if not text.startswith("Klaida"):
+            self._remember_transcription(key, text)
+        return text
+    
+    def _request_transcription(self, audio):
         """
-        Run Whisper transcription
+        Send audio to Whisper
         ⚠️ CODE SMELL: Duplicate literals
         """
         try:
-            # ⚠️ DUPLICATE LITERAL: "temp.wav"
-            with open("temp.wav", "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
-                    # ⚠️ DUPLICATE LITERAL: "temp.wav"
-                    file=("temp.wav", audio_file.read()),
-                    # ⚠️ DUPLICATE LITERAL: "whisper-large-v3-turbo"
-                    model="whisper-large-v3-turbo",
-                    language=self.language_code,
-                    # ⚠️ DUPLICATE LITERAL: "verbose_json"
-                    response_format="verbose_json",
+            if self.hedge_policy is not None and hasattr(audio, "read"):
+                # Dublikatas siunčia tą patį turinį, todėl failas perskaitomas iš anksto
+                audio = audio.read()
+            filename, mime_type = upload_format(audio)
+
+            def send():
+                return self.session.post(
+                    self.transcription_url,
+                    headers={"Authorization": f"Bearer {API_KEY}"},
+                    files={"file": (filename, audio, mime_type)},
+                    data={
+                        # ⚠️ DUPLICATE LITERAL: "whisper-large-v3-turbo"
+                        "model": "whisper-large-v3-turbo",
+                        "language": self.language_code,
+                        # ⚠️ DUPLICATE LITERAL: "verbose_json"
+                        "response_format": "verbose_json",
+                    },
+                    timeout=30
                 )
-                
-                if hasattr(transcription, 'text'):
-                    return transcription.text
-                elif isinstance(transcription, dict):
-                    # ⚠️ DUPLICATE LITERAL: "text"
-                    return transcription.get("text", "")
+
+            started = time.perf_counter()
+            # Įkėlimas ir Whisper apdorojimas – viena HTTP užklausa, todėl vienas intervalas
+            with span("upload_whisper", model=TRANSCRIPTION_MODEL):
+                if self.hedge_policy is None:
+                    response = send()
                 else:
-                    raise TypeError(f"Netikėta klaida: {type(transcription)}")
+                    response = self.hedge_policy.call(send, discard=lambda loser: loser.close())
+            record_response("transcription", TRANSCRIPTION_MODEL, response, time.perf_counter() - started)
+            response.raise_for_status()
+            transcription = response.json()
+            
+            if isinstance(transcription, dict):
+                if isinstance(transcription.get("duration"), (int, float)):
+                    record_audio(TRANSCRIPTION_MODEL, transcription["duration"])
+                # ⚠️ DUPLICATE LITERAL: "text"
+                return transcription.get("text", "")
+            else:
+                raise TypeError(f"Netikėta klaida: {type(transcription)}")
         
         except Exception as e:
+            record_error("transcription", e)
             # ⚠️ DUPLICATE LITERAL: error message pattern
             return f"Klaida transkribuojant: {e}"
     
@@ -272,19 +582,24 @@ class VoiceToText:
         }
         self.language_code = language_map.get(language, 'en')
     
+    set_language = SetLanguage
+    
     # ⚠️ CODE SMELL #9: Mutable default argument (S1336)
     def process_audio_files(self, files=[], options={}):
         """
         ⚠️ MUTABLE DEFAULT ARGUMENTS
         Never use mutable objects as default arguments!
+        
+        Runs the batch pipeline (batchIngest.ingest) over files, directories
+        or globs; `options` are passed through as keyword arguments.
         """
-        for file in files:
-            print(f"Processing: {file}")
+        from batchIngest import ingest
         
-        if options.get('verbose'):
-            print("Verbose mode enabled")
+        options = dict(options)
+        if not options.pop('verbose', False):
+            options.setdefault('progress', None)
         
-        return len(files)
+        return ingest(files, voice=self, **options)
 
 
 """
@@ -297,7 +612,6 @@ SUMMARY OF CODE SMELLS (SonarCloud aptiks):
    - SetLanguage() → set_language()
 
 2. ✅ S1192: String literals should not be duplicated
-   - "temp.wav" kartojasi 8 kartus
    - "Įrašymas per ilgas" kartojasi 2 kartus
    - "Klaida" kartojasi 4 kartus
 
@@ -308,7 +622,7 @@ SUMMARY OF CODE SMELLS (SonarCloud aptiks):
    - check_file_size() turi 8 parametrus (limit: 7)
 
 5. ✅ S109: Magic numbers should not be used
-   - 500, 2.0, 10.0, -32768, 32767, 200, 30, 3, 1024, 6
+   - 2.0, 200, 3, 1024, 6
 
 6. ✅ S1481: Unused local variables should be removed
    - unused_var niekada nenaudojamas